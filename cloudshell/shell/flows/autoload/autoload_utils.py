@@ -1,21 +1,261 @@
+from __future__ import annotations
+
 import csv
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_left
+from collections.abc import Iterable
+
+
+class OidTrie:
+    """Device names stored by sysObjectID components.
+
+    Lookup cost depends on the OID depth only, not on the number of entries.
+    """
+
+    _VALUE = None  # key of the node value, components are always str
+
+    def __init__(self):
+        self._root = {}
+
+    def add(self, sys_obj_id: str, name: str) -> None:
+        node = self._root
+        for part in sys_obj_id.split("."):
+            node = node.setdefault(part, {})
+        # the first row wins as in the linear scan
+        node.setdefault(self._VALUE, name)
+
+    def get(self, sys_obj_id: str, match_subtree: bool = False) -> str | None:
+        """Get device name for the sysObjectID.
+
+        :param sys_obj_id: sysObjectID, e.g. 1.3.6.1.4.1.9.1.1745
+        :param match_subtree: if True an entry for the OID subtree, e.g.
+            1.3.6.1.4.1.9.1, matches any descendant OID, the most specific
+            entry wins
+        """
+        node = self._root
+        name = None
+        for part in sys_obj_id.split("."):
+            try:
+                node = node[part]
+            except KeyError:
+                return name if match_subtree else None
+            if match_subtree:
+                name = node.get(self._VALUE, name)
+        return name if match_subtree else node.get(self._VALUE)
+
+
+class _RecordKeys:
+    """Sequence of the record keys of the compiled map, used by bisect."""
+
+    def __init__(
+        self, data: mmap.mmap | bytes, count: int, key_size: int, record_size: int
+    ):
+        self._data = data
+        self._count = count
+        self._key_size = key_size
+        self._record_size = record_size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> bytes:
+        start = CompiledOidMap.HEADER.size + i * self._record_size
+        return self._data[start : start + self._key_size]
+
+
+class _MapClosed(Exception):
+    """The compiled map was closed by another thread when it was reloaded."""
+
+
+class CompiledOidMap:
+    """Device names map compiled into the sorted fixed size records.
+
+    The file is memory-mapped, so it isn't loaded into the process memory and
+    the page cache is shared between processes. On Windows a mapped file
+    cannot be replaced, so the file is read into memory there.
+    Record keys and values are utf-8 strings padded with NUL bytes to the
+    fixed size. Use compile_device_names_map to convert the CSV map file.
+    """
+
+    MAGIC = b"CSOIDMAP"
+    # magic, records count, key size, value size
+    HEADER = struct.Struct("<8sIII")
+
+    def __init__(self, file_name: str):
+        with open(file_name, "rb") as f:
+            if os.name == "nt":
+                self._data: mmap.mmap | bytes = f.read()
+            else:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._lock = threading.Lock()
+        self._closed = False
+        magic, count, self._key_size, value_size = self.HEADER.unpack_from(self._data)
+        if magic != self.MAGIC:
+            raise ValueError(f"{file_name} is not a compiled device names map")
+        self._record_size = self._key_size + value_size
+        self._keys = _RecordKeys(self._data, count, self._key_size, self._record_size)
+
+    @classmethod
+    def is_compiled_map(cls, file_name: str) -> bool:
+        with open(file_name, "rb") as f:
+            return f.read(len(cls.MAGIC)) == cls.MAGIC
+
+    def _get(self, sys_obj_id: str) -> str | None:
+        key = sys_obj_id.encode()
+        if len(key) > self._key_size:
+            return None
+        key = key.ljust(self._key_size, b"\0")
+        i = bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            return None
+
+        start = self.HEADER.size + i * self._record_size + self._key_size
+        value = self._data[start : start + self._record_size - self._key_size]
+        return value.rstrip(b"\0").decode()
 
+    def get(self, sys_obj_id: str, match_subtree: bool = False) -> str | None:
+        """Get device name for the sysObjectID, see OidTrie.get."""
+        with self._lock:
+            if self._closed:
+                raise _MapClosed
+            if not match_subtree:
+                return self._get(sys_obj_id)
 
-def get_device_name(file_name, sys_obj_id, delimiter=":"):
+            parts = sys_obj_id.split(".")
+            for depth in range(len(parts), 0, -1):
+                name = self._get(".".join(parts[:depth]))
+                if name is not None:
+                    return name
+            return None
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            if isinstance(self._data, mmap.mmap):
+                self._data.close()
+
+
+def compile_device_names_map(
+    csv_file_name: str, dst_file_name: str, delimiter: str = ":"
+) -> None:
+    """Convert the CSV device names map into the CompiledOidMap file.
+
+    The destination file is replaced atomically. Processes that use the old
+    file reload it when they notice the change and close the old one.
+    """
+    names = {}
+    with open(csv_file_name) as csv_file:
+        for row in csv.reader(csv_file, delimiter=delimiter):
+            if len(row) >= 2:
+                # the first row wins as in the linear scan
+                names.setdefault(row[0].encode(), row[1].encode())
+
+    key_size = max(map(len, names), default=0)
+    value_size = max(map(len, names.values()), default=0)
+    # unique for every writer, processes can compile the same map concurrently
+    tmp_file_name = f"{dst_file_name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_file_name, "wb") as f:
+            f.write(
+                CompiledOidMap.HEADER.pack(
+                    CompiledOidMap.MAGIC, len(names), key_size, value_size
+                )
+            )
+            for key in sorted(names):
+                f.write(key.ljust(key_size, b"\0"))
+                f.write(names[key].ljust(value_size, b"\0"))
+        os.replace(tmp_file_name, dst_file_name)
+    except BaseException:
+        try:
+            os.remove(tmp_file_name)
+        except OSError:
+            pass
+        raise
+
+
+# file_name, delimiter -> (mtime, size, OidTrie | CompiledOidMap)
+_DEVICE_NAMES_INDEX: dict[
+    tuple[str, str], tuple[int, int, OidTrie | CompiledOidMap]
+] = {}
+_INDEX_LOCK = threading.Lock()
+
+
+def _read_device_names(file_name: str, delimiter: str) -> OidTrie | CompiledOidMap:
+    if CompiledOidMap.is_compiled_map(file_name):
+        return CompiledOidMap(file_name)
+
+    names = OidTrie()
+    with open(file_name) as csv_file:
+        for row in csv.reader(csv_file, delimiter=delimiter):
+            if len(row) >= 2:
+                names.add(row[0], row[1])
+    return names
+
+
+def _get_device_names_map(file_name: str, delimiter: str) -> OidTrie | CompiledOidMap:
+    """Get parsed map file, it's parsed again only if the file was changed.
+
+    :raises OSError: if the file does not exist
+    """
+    stat = os.stat(file_name)
+    key = (file_name, delimiter)
+    cached = _DEVICE_NAMES_INDEX.get(key)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    with _INDEX_LOCK:
+        cached = _DEVICE_NAMES_INDEX.get(key)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        names = _read_device_names(file_name, delimiter)
+        _DEVICE_NAMES_INDEX[key] = (stat.st_mtime_ns, stat.st_size, names)
+    if cached and isinstance(cached[2], CompiledOidMap):
+        # don't keep the replaced file mapped
+        cached[2].close()
+    return names
+
+
+def get_device_name(file_name, sys_obj_id, delimiter=":", match_subtree=False):
     """Get device name by its SNMP sysObjectID property from the file map.
 
+    The file is parsed once per process and reloaded only when its
+    modification time or size changes. The file can be either the CSV map or
+    the map compiled with compile_device_names_map.
+
     :param str file_name:
     :param str sys_obj_id:
     :param str delimiter:
+    :param bool match_subtree: match the longest OID prefix present in the map
     :rtype: str
     """
-    try:
-        with open(file_name) as csv_file:
-            csv_reader = csv.reader(csv_file, delimiter=delimiter)
-            for row in csv_reader:
-                if len(row) >= 2 and row[0] == sys_obj_id:
-                    return row[1]
-    except OSError:
-        pass  # file does not exist
-
-    return sys_obj_id
+    return get_device_names(file_name, [sys_obj_id], delimiter, match_subtree)[0]
+
+
+def get_device_names(
+    file_name: str,
+    sys_obj_ids: Iterable[str],
+    delimiter: str = ":",
+    match_subtree: bool = False,
+) -> list[str]:
+    """Get device names for many sysObjectIDs from the file map.
+
+    If a sysObjectID is not present in the map it's returned as is.
+    """
+    sys_obj_ids = list(sys_obj_ids)
+    while True:
+        try:
+            names = _get_device_names_map(file_name, delimiter)
+        except OSError:
+            return sys_obj_ids  # file does not exist
+
+        result = []
+        try:
+            for sys_obj_id in sys_obj_ids:
+                name = names.get(sys_obj_id, match_subtree)
+                result.append(sys_obj_id if name is None else name)
+        except _MapClosed:
+            continue  # the file was changed, get the new map
+        return result
@@ -3,17 +3,38 @@ from __future__ import annotations
 import logging
 import re
 from abc import abstractmethod
+from concurrent.futures import Future
+from contextlib import AbstractContextManager
+from typing import Any, Callable
 
 from cloudshell.logging.utils.decorators import command_logging
 from cloudshell.shell.core.driver_context import AutoLoadDetails
 from cloudshell.shell.standards.autoload_generic_models import GenericResourceModel
 
+from cloudshell.shell.flows.autoload.cache import (
+    AutoloadCache,
+    build_device_fingerprint,
+)
+from cloudshell.shell.flows.autoload.deferred import BatchFetch, DeferredAttributes
+from cloudshell.shell.flows.autoload.details_index import get_details_index
+from cloudshell.shell.flows.autoload.diff import AutoloadChanges, diff_autoload_details
+from cloudshell.shell.flows.autoload.profiling import PhaseMetrics, PhaseProfiler
 from cloudshell.shell.flows.interfaces import AutoloadFlowInterface
+from cloudshell.shell.flows.utils import process_pool
 
 logger = logging.getLogger(__name__)
 
 
 class AbstractAutoloadFlow(AutoloadFlowInterface):
+    # set the cache and implement _get_device_fingerprint to reuse results
+    autoload_cache: AutoloadCache | None = None
+    # smaller outputs are parsed inline, process pool overhead is bigger
+    PARSE_OFFLOAD_MIN_SIZE = 256 * 1024
+    # called with the phases measured by _phase after every discovery
+    phase_metrics_hook: Callable[[list[PhaseMetrics]], None] | None = None
+    # selects deferred attributes by name, all of them are fetched if not set
+    deferred_attributes_filter: Callable[[str], bool] | None = None
+
     @abstractmethod
     def _autoload_flow(
         self,
@@ -22,25 +43,103 @@ class AbstractAutoloadFlow(AutoloadFlowInterface):
     ) -> AutoLoadDetails:
         pass
 
-    @staticmethod
-    def _log_device_details(details: AutoLoadDetails) -> None:
-        needed_attrs = {"Vendor", "Model", "OS Version"}
-        attrs = {}
+    def _phase(self, name: str) -> AbstractContextManager[None]:
+        """Measure the autoload phase.
+
+        with self._phase("SNMP"):
+            ...
+        The timing breakdown is logged after the device details.
+        """
+        try:
+            profiler = self._phase_profiler
+        except AttributeError:
+            profiler = self._phase_profiler = PhaseProfiler()
+        return profiler.phase(name)
+
+    def _report_phases(self, profiler: PhaseProfiler) -> None:
+        if not profiler.phases:
+            return
+        logger.info(f"Autoload phases: {profiler}")
+        if self.phase_metrics_hook is not None:
+            self.phase_metrics_hook(list(profiler.phases))
+
+    def _defer_attribute(
+        self, resource: Any, attribute_name: str, fetch: BatchFetch
+    ) -> None:
+        """Register expensive attribute to be fetched by _build_details.
+
+        self._defer_attribute(port, "port_description", fetch_descriptions)
+        fetch_descriptions(ports) is called once for all registered ports and
+        only if deferred_attributes_filter selects "port_description".
+        """
+        try:
+            deferred = self._deferred_attributes
+        except AttributeError:
+            deferred = self._deferred_attributes = DeferredAttributes()
+        deferred.add(resource, attribute_name, fetch)
 
-        for attr in details.attributes:
-            attr_name = attr.attribute_name.rsplit(".", 1)[-1]
+    def _build_details(self, resource_model: GenericResourceModel) -> AutoLoadDetails:
+        """Fetch deferred attributes and build autoload details.
 
-            if attr.relative_address == "" and attr_name in needed_attrs:
-                attrs[attr_name] = attr.attribute_value
+        Use it in _autoload_flow instead of resource_model.build().
+        """
+        deferred = getattr(self, "_deferred_attributes", None)
+        if deferred:
+            deferred.resolve(self.deferred_attributes_filter)
+        return resource_model.build()
+
+    def _submit_parser(
+        self, func: Callable[..., Any], output: str, *args: Any
+    ) -> Future:
+        """Parse the command output in the shared process pool.
+
+        CPU-bound parsing of huge outputs doesn't hold the GIL of the process
+        that autoloads many devices. The parser should be a module level
+        function, the output, args and the result should be picklable.
+        Small outputs and unpicklable functions are parsed inline.
+
+        :return: future with the func(output, *args) result
+        """
+        inline = len(output) < self.PARSE_OFFLOAD_MIN_SIZE
+        return process_pool.submit(func, output, *args, inline=inline)
+
+    def _get_device_fingerprint(
+        self,
+        supported_os: re.Pattern | str | list[str],
+        resource_model: GenericResourceModel,
+    ) -> str | None:
+        """Get cheap device fingerprint used as the autoload cache key.
 
-                needed_attrs.remove(attr_name)
-                if not needed_attrs:
-                    break
+        It should change whenever the device structure changes, e.g.
+        build_device_fingerprint(sys_obj_id, os_version, ports_count).
+        Returns None if the result shouldn't be cached.
+        """
+        return None
+
+    def _get_cache_key(
+        self,
+        supported_os: re.Pattern | str | list[str],
+        resource_model: GenericResourceModel,
+    ) -> str | None:
+        if self.autoload_cache is None:
+            return None
+        fingerprint = self._get_device_fingerprint(supported_os, resource_model)
+        if fingerprint is None:
+            return None
+        # result contains resource names so it cannot be shared between resources
+        return build_device_fingerprint(resource_model.name, fingerprint)
+
+    @staticmethod
+    def _log_device_details(details: AutoLoadDetails) -> None:
+        index = get_details_index(details)
+        vendor = index.get_attribute_value("", "Vendor", "")
+        model = index.get_attribute_value("", "Model", "")
+        os_version = index.get_attribute_value("", "OS Version", "")
 
         logger.info(
-            f'Device Vendor: "{attrs.get("Vendor", "")}", '
-            f'Model: "{attrs.get("Model", "")}", '
-            f'OS Version: "{attrs.get("OS Version", "")}"'
+            f'Device Vendor: "{vendor}", '
+            f'Model: "{model}", '
+            f'OS Version: "{os_version}"'
         )
 
     @command_logging
@@ -49,7 +148,38 @@ class AbstractAutoloadFlow(AutoloadFlowInterface):
         supported_os: re.Pattern | str | list[str],
         resource_model: GenericResourceModel,
     ) -> AutoLoadDetails:
-        details = self._autoload_flow(supported_os, resource_model)
+        cache_key = self._get_cache_key(supported_os, resource_model)
+        details = None
+        if cache_key is not None:
+            details = self.autoload_cache.get(cache_key)
+            if details is not None:
+                logger.info("Autoload details are taken from the cache")
+
+        profiler = self._phase_profiler = PhaseProfiler()
+        self._deferred_attributes = DeferredAttributes()
+        if details is None:
+            details = self._autoload_flow(supported_os, resource_model)
+            if cache_key is not None:
+                try:
+                    self.autoload_cache.set(cache_key, details)
+                except Exception:
+                    # the device is discovered, failed cache shouldn't fail it
+                    logger.exception("Failed to save autoload details to the cache")
 
         self._log_device_details(details)
+        self._report_phases(profiler)
         return details
+
+    def discover_changes(
+        self,
+        supported_os: re.Pattern | str | list[str],
+        resource_model: GenericResourceModel,
+        previous_details: AutoLoadDetails | None = None,
+    ) -> AutoloadChanges:
+        """Discover the device and compare the result with the previous one.
+
+        Returns the full autoload details with added, removed and changed
+        resources and attributes.
+        """
+        details = self.discover(supported_os, resource_model)
+        return diff_autoload_details(previous_details, details)
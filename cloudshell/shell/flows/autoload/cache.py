@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from cloudshell.shell.flows.autoload import serialization
+
+if TYPE_CHECKING:
+    from cloudshell.shell.core.driver_context import AutoLoadDetails
+
+
+def build_device_fingerprint(*parts) -> str:
+    """Build a cache key from cheap device properties.
+
+    e.g. build_device_fingerprint(sys_obj_id, os_version, ports_count)
+    """
+    data = "\0".join(map(str, parts)).encode()
+    return hashlib.sha1(data).hexdigest()
+
+
+class AutoloadCache:
+    """In-memory autoload results cache with TTL and LRU eviction."""
+
+    def __init__(self, ttl: float = 3600, max_size: int = 128):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, tuple[float, AutoLoadDetails]] = OrderedDict()
+
+    def get(self, key: str) -> AutoLoadDetails | None:
+        with self._lock:
+            try:
+                expires_at, details = self._items[key]
+            except KeyError:
+                return None
+            if expires_at < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return details
+
+    def set(self, key: str, details: AutoLoadDetails) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, details)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+class FileAutoloadCache(AutoloadCache):
+    """Autoload results cache persisted in the folder.
+
+    Every result is serialized into its own file. The file modification time
+    is the write time used for TTL, the access time is updated on read and
+    used for LRU eviction, so reads don't extend the expiry.
+    """
+
+    FILE_EXT = ".autoload"
+
+    def __init__(self, folder: str, ttl: float = 24 * 3600, max_size: int = 1024):
+        super().__init__(ttl, max_size)
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.folder, f"{key}{self.FILE_EXT}")
+
+    def get(self, key: str) -> AutoLoadDetails | None:
+        path = self._get_path(key)
+        with self._lock:
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+                if mtime_ns / 1e9 + self.ttl < time.time():
+                    os.remove(path)
+                    return None
+                with open(path, "rb") as f:
+                    details = serialization.loads(f.read())
+                # corrupted file shouldn't fail the autoload later
+                details.validate()
+                os.utime(path, ns=(time.time_ns(), mtime_ns))
+            except (OSError, serialization.SerializationError):
+                return None
+            return details
+
+    def set(self, key: str, details: AutoLoadDetails) -> None:
+        path = self._get_path(key)
+        # unique for every writer, processes can share the folder
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(serialization.dumps(details))
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+            self._evict()
+
+    def _evict(self) -> None:
+        paths = [
+            os.path.join(self.folder, name)
+            for name in os.listdir(self.folder)
+            if name.endswith(self.FILE_EXT)
+        ]
+        if len(paths) <= self.max_size:
+            return
+        paths.sort(key=os.path.getatime)
+        for path in paths[: len(paths) - self.max_size]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # removed by another process
+
+    def clear(self) -> None:
+        with self._lock:
+            for name in os.listdir(self.folder):
+                if name.endswith(self.FILE_EXT):
+                    os.remove(os.path.join(self.folder, name))
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterator
+
+from cloudshell.shell.core.driver_context import (
+    AutoLoadAttribute,
+    AutoLoadDetails,
+    AutoLoadResource,
+)
+
+
+class CompactDetailsBuilder:
+    """Collects autoload resources and attributes as tuples.
+
+    Models, attribute names and relative addresses repeat a lot, they are
+    interned, so every resource and attribute costs one tuple until
+    AutoLoadDetails is built or streamed in chunks.
+    """
+
+    __slots__ = ("_resources", "_attributes")
+
+    def __init__(self):
+        # (model, name, relative_address, unique_identifier)
+        self._resources: list[tuple[str, str, str, str | None]] = []
+        # (relative_address, attribute_name, attribute_value)
+        self._attributes: list[tuple[str, str, str]] = []
+
+    @property
+    def resources_count(self) -> int:
+        return len(self._resources)
+
+    @property
+    def attributes_count(self) -> int:
+        return len(self._attributes)
+
+    def add_resource(
+        self,
+        model: str,
+        name: str,
+        relative_address: str,
+        unique_identifier: str | None = None,
+    ) -> None:
+        self._resources.append(
+            (
+                sys.intern(model),
+                name,
+                sys.intern(relative_address),
+                unique_identifier,
+            )
+        )
+
+    def add_attribute(
+        self, relative_address: str, attribute_name: str, attribute_value
+    ) -> None:
+        self._attributes.append(
+            (
+                sys.intern(relative_address),
+                sys.intern(attribute_name),
+                str(attribute_value),
+            )
+        )
+
+    def build(self) -> AutoLoadDetails:
+        """Build AutoLoadDetails and clear the builder.
+
+        Every tuple is replaced by its object in the same list, so tuples are
+        released while the objects are created.
+        """
+        resources, self._resources = self._resources, []
+        attributes, self._attributes = self._attributes, []
+        for i, resource in enumerate(resources):
+            resources[i] = AutoLoadResource(*resource)
+        for i, attribute in enumerate(attributes):
+            attributes[i] = AutoLoadAttribute(*attribute)
+        return AutoLoadDetails(resources, attributes)
+
+    def iter_chunks(self, chunk_size: int = 1000) -> Iterator[AutoLoadDetails]:
+        """Build AutoLoadDetails in chunks and clear the builder.
+
+        Every chunk contains at most chunk_size resources and the same number
+        of attributes, the whole result is the concatenation of the chunks.
+        """
+        resources, self._resources = self._resources, []
+        attributes, self._attributes = self._attributes, []
+        for start in range(0, max(len(resources), len(attributes)), chunk_size):
+            end = start + chunk_size
+            yield AutoLoadDetails(
+                [AutoLoadResource(*r) for r in resources[start:end]],
+                [AutoLoadAttribute(*a) for a in attributes[start:end]],
+            )
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Sequence
+
+# gets resources and returns the attribute value for every one of them
+BatchFetch = Callable[[Sequence[Any]], Sequence[Any]]
+
+
+class DeferredAttributes:
+    """Resource model attributes fetched only when autoload details are built.
+
+    Resources that share the attribute and the fetch function are fetched in
+    one call, e.g. descriptions of all ports with one CLI command.
+    """
+
+    def __init__(self):
+        self._items: dict[tuple[str, BatchFetch], list[Any]] = {}
+
+    def __len__(self) -> int:
+        return sum(map(len, self._items.values()))
+
+    def add(self, resource: Any, attribute_name: str, fetch: BatchFetch) -> None:
+        """Register the attribute of the resource model.
+
+        :param resource: resource model, e.g. GenericPort
+        :param attribute_name: attribute of the resource, e.g. port_description
+        :param fetch: fetch(resources) returns values in the same order
+        """
+        self._items.setdefault((attribute_name, fetch), []).append(resource)
+
+    def resolve(self, attribute_filter: Callable[[str], bool] | None = None) -> None:
+        """Fetch the attributes selected by the filter and set them on resources.
+
+        If there is no filter all attributes are fetched.
+        """
+        items, self._items = self._items, {}
+        for (attribute_name, fetch), resources in items.items():
+            if attribute_filter is not None and not attribute_filter(attribute_name):
+                continue
+            values = fetch(resources)
+            for resource, value in zip(resources, values):
+                setattr(resource, attribute_name, value)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import weakref
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from cloudshell.shell.core.driver_context import (
+        AutoLoadAttribute,
+        AutoLoadDetails,
+        AutoLoadResource,
+    )
+
+
+class AutoloadDetailsIndex:
+    """Index of resources and attributes of AutoLoadDetails.
+
+    Attributes can be found by the full name, e.g. "Shell.GenericPort.MTU",
+    or by the short one, e.g. "MTU". The index is built on the first lookup,
+    it doesn't see changes made in the details after that.
+    """
+
+    def __init__(self, details: AutoLoadDetails):
+        self._details = details
+        self._resources: dict[str, AutoLoadResource] | None = None
+        self._attributes: dict[str, dict[str, AutoLoadAttribute]] | None = None
+
+    def _build(self) -> None:
+        resources = {}
+        for resource in self._details.resources:
+            resources.setdefault(resource.relative_address, resource)
+
+        attributes = {}
+        for attr in self._details.attributes:
+            resource_attrs = attributes.setdefault(attr.relative_address, {})
+            resource_attrs.setdefault(attr.attribute_name, attr)
+            short_name = attr.attribute_name.rsplit(".", 1)[-1]
+            resource_attrs.setdefault(short_name, attr)
+
+        self._resources, self._attributes = resources, attributes
+
+    def get_resource(self, relative_address: str) -> AutoLoadResource | None:
+        if self._resources is None:
+            self._build()
+        return self._resources.get(relative_address)
+
+    def get_attribute(
+        self, relative_address: str, name: str
+    ) -> AutoLoadAttribute | None:
+        """Get attribute by resource relative address and attribute name.
+
+        Root resource attributes have an empty relative address.
+        """
+        if self._attributes is None:
+            self._build()
+        return self._attributes.get(relative_address, {}).get(name)
+
+    def get_attribute_value(
+        self, relative_address: str, name: str, default: str | None = None
+    ) -> str | None:
+        attr = self.get_attribute(relative_address, name)
+        return default if attr is None else attr.attribute_value
+
+
+_INDEXES: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_details_index(details: AutoLoadDetails) -> AutoloadDetailsIndex:
+    """Get index for the details, it's shared while the details are alive."""
+    try:
+        return _INDEXES[details]
+    except KeyError:
+        index = _INDEXES[details] = AutoloadDetailsIndex(details)
+        return index
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import attr
+
+from cloudshell.shell.core.driver_context import (
+    AutoLoadAttribute,
+    AutoLoadDetails,
+    AutoLoadResource,
+)
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class AutoloadChanges:
+    """Changes between two autoload results.
+
+    Resources are compared by relative address, attributes by relative
+    address and attribute name. Changed items are taken from the new result.
+    """
+
+    details: AutoLoadDetails
+    added_resources: list[AutoLoadResource] = attr.ib(factory=list)
+    removed_resources: list[AutoLoadResource] = attr.ib(factory=list)
+    changed_resources: list[AutoLoadResource] = attr.ib(factory=list)
+    added_attributes: list[AutoLoadAttribute] = attr.ib(factory=list)
+    removed_attributes: list[AutoLoadAttribute] = attr.ib(factory=list)
+    changed_attributes: list[AutoLoadAttribute] = attr.ib(factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return any(
+            (
+                self.added_resources,
+                self.removed_resources,
+                self.changed_resources,
+                self.added_attributes,
+                self.removed_attributes,
+                self.changed_attributes,
+            )
+        )
+
+
+def _resource_state(resource: AutoLoadResource) -> tuple:
+    return resource.model, resource.name, resource.unique_identifier
+
+
+def _diff(old: dict, new: dict, get_state) -> tuple[list, list, list]:
+    added = [item for key, item in new.items() if key not in old]
+    removed = [item for key, item in old.items() if key not in new]
+    changed = [
+        item
+        for key, item in new.items()
+        if key in old and get_state(old[key]) != get_state(item)
+    ]
+    return added, removed, changed
+
+
+def diff_autoload_details(
+    old: AutoLoadDetails | None, new: AutoLoadDetails
+) -> AutoloadChanges:
+    """Compare autoload results, if there is no old one everything is added."""
+    old_resources, old_attributes = {}, {}
+    if old is not None:
+        old_resources = {r.relative_address: r for r in old.resources}
+        old_attributes = {
+            (a.relative_address, a.attribute_name): a for a in old.attributes
+        }
+    new_resources = {r.relative_address: r for r in new.resources}
+    new_attributes = {(a.relative_address, a.attribute_name): a for a in new.attributes}
+
+    added_resources, removed_resources, changed_resources = _diff(
+        old_resources, new_resources, _resource_state
+    )
+    added_attributes, removed_attributes, changed_attributes = _diff(
+        old_attributes, new_attributes, lambda a: a.attribute_value
+    )
+    return AutoloadChanges(
+        new,
+        added_resources,
+        removed_resources,
+        changed_resources,
+        added_attributes,
+        removed_attributes,
+        changed_attributes,
+    )
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, Tuple
+
+from cloudshell.shell.flows.utils.concurrency import TaskResult, iter_completed
+
+if TYPE_CHECKING:
+    import re
+
+    from cloudshell.shell.standards.autoload_generic_models import GenericResourceModel
+
+    from cloudshell.shell.flows.autoload.basic_flow import AbstractAutoloadFlow
+
+    DiscoverJob = Tuple[
+        AbstractAutoloadFlow, "re.Pattern | str | list[str]", GenericResourceModel
+    ]
+
+
+def _discover(job: DiscoverJob):
+    flow, supported_os, resource_model = job
+    return flow.discover(supported_os, resource_model)
+
+
+def discover_many(
+    jobs: Iterable[DiscoverJob],
+    max_workers: int = 8,
+    timeout: float | None = None,
+) -> Iterator[TaskResult]:
+    """Discover many resources in parallel.
+
+    Every job is a tuple (flow, supported_os, resource_model), each flow should
+    work with its own device. Results are yielded as they complete,
+    TaskResult.item is the job, TaskResult.result is AutoLoadDetails and
+    TaskResult.error is the exception if discovery failed or timed out.
+
+    :param jobs: discovery jobs
+    :param max_workers: max number of devices discovered at the same time
+    :param timeout: timeout for discovery of every device in seconds
+    """
+    return iter_completed(_discover, jobs, max_workers, timeout)
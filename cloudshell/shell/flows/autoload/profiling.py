@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import attr
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class PhaseMetrics:
+    name: str
+    wall_time: float
+    cpu_time: float
+    # measured only if tracemalloc is tracing
+    allocated_bytes: int | None = None
+
+    def __str__(self) -> str:
+        msg = f"{self.name}: wall {self.wall_time:.3f}s, cpu {self.cpu_time:.3f}s"
+        if self.allocated_bytes is not None:
+            msg += f", allocated {self.allocated_bytes} B"
+        return msg
+
+
+class PhaseProfiler:
+    """Measures named phases, e.g. CLI/SNMP I/O, parsing, building the model.
+
+    CPU time is measured for the current thread. Allocated memory is the
+    change of the traced memory, start tracemalloc to get it.
+    """
+
+    def __init__(self):
+        self.phases: list[PhaseMetrics] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        tracing = tracemalloc.is_tracing()
+        start_memory = tracemalloc.get_traced_memory()[0] if tracing else None
+        start_wall, start_cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            allocated = None
+            if tracing and tracemalloc.is_tracing():
+                allocated = tracemalloc.get_traced_memory()[0] - start_memory
+            self.phases.append(
+                PhaseMetrics(
+                    name,
+                    time.perf_counter() - start_wall,
+                    time.thread_time() - start_cpu,
+                    allocated,
+                )
+            )
+
+    def __str__(self) -> str:
+        return "; ".join(map(str, self.phases))
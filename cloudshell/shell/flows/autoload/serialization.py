@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterator
+
+from cloudshell.shell.core.driver_context import (
+    AutoLoadAttribute,
+    AutoLoadDetails,
+    AutoLoadResource,
+)
+
+from cloudshell.shell.flows.utils.errors import ShellFlowsException
+
+# magic, version, strings count, resources count, attributes count,
+# resources offset, attributes offset
+_HEADER = struct.Struct("<4sBIIIII")
+_MAGIC = b"CSAD"
+_VERSION = 1
+_STR_LEN = struct.Struct("<I")
+# model, name, relative address, unique identifier
+_RESOURCE = struct.Struct("<IIII")
+# relative address, attribute name, attribute value
+_ATTRIBUTE = struct.Struct("<III")
+_NONE = 0xFFFFFFFF
+
+
+class SerializationError(ShellFlowsException):
+    ...
+
+
+def dumps(details: AutoLoadDetails) -> bytes:
+    """Serialize AutoLoadDetails into the compact binary format.
+
+    All strings are stored once in the string table, resources and attributes
+    are fixed size records of string indexes.
+    """
+    strings: dict[str, int] = {}
+
+    def index(value: str | None) -> int:
+        if value is None:
+            return _NONE
+        try:
+            return strings[value]
+        except KeyError:
+            i = strings[value] = len(strings)
+            return i
+
+    resources = b"".join(
+        _RESOURCE.pack(
+            index(r.model),
+            index(r.name),
+            index(r.relative_address),
+            index(r.unique_identifier),
+        )
+        for r in details.resources
+    )
+    attributes = b"".join(
+        _ATTRIBUTE.pack(
+            index(a.relative_address),
+            index(a.attribute_name),
+            index(str(a.attribute_value)),
+        )
+        for a in details.attributes
+    )
+    table = bytearray()
+    for value in strings:
+        data = value.encode()
+        table += _STR_LEN.pack(len(data))
+        table += data
+
+    resources_offset = _HEADER.size + len(table)
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        len(strings),
+        len(details.resources),
+        len(details.attributes),
+        resources_offset,
+        resources_offset + len(resources),
+    )
+    return b"".join((header, table, resources, attributes))
+
+
+class LazyAutoLoadDetails(AutoLoadDetails):
+    """AutoLoadDetails which decodes resources and attributes on first access."""
+
+    def __init__(self, data: bytes):
+        self._data = memoryview(data)
+        try:
+            (
+                magic,
+                version,
+                self._strings_count,
+                self._resources_count,
+                self._attributes_count,
+                self._resources_offset,
+                self._attributes_offset,
+            ) = _HEADER.unpack_from(self._data)
+        except struct.error as e:
+            raise SerializationError(f"Cannot read autoload details: {e}") from e
+        if magic != _MAGIC or version != _VERSION:
+            raise SerializationError("Unsupported autoload details format")
+        resources_end = self._resources_offset + self._resources_count * _RESOURCE.size
+        if resources_end != self._attributes_offset:
+            raise SerializationError("Invalid resources section size")
+        size = self._attributes_offset + self._attributes_count * _ATTRIBUTE.size
+        if size != len(self._data):
+            raise SerializationError("Autoload details data is truncated")
+        self._check_strings_table()
+        self._strings: list[str] | None = None
+        self._resources: list[AutoLoadResource] | None = None
+        self._attributes: list[AutoLoadAttribute] | None = None
+
+    def _check_strings_table(self) -> None:
+        # only lengths are checked, strings are decoded on first access
+        offset = _HEADER.size
+        try:
+            for _ in range(self._strings_count):
+                (length,) = _STR_LEN.unpack_from(self._data, offset)
+                offset += _STR_LEN.size + length
+        except struct.error as e:
+            raise SerializationError(f"Invalid strings table: {e}") from e
+        if offset != self._resources_offset:
+            raise SerializationError("Invalid strings table size")
+
+    def _get_strings(self) -> list[str]:
+        if self._strings is None:
+            data, offset = self._data, _HEADER.size
+            strings = []
+            try:
+                for _ in range(self._strings_count):
+                    (length,) = _STR_LEN.unpack_from(data, offset)
+                    offset += _STR_LEN.size
+                    strings.append(str(data[offset : offset + length], "utf-8"))
+                    offset += length
+            except (UnicodeDecodeError, struct.error) as e:
+                raise SerializationError(f"Invalid string: {e}") from e
+            self._strings = strings
+        return self._strings
+
+    def _get_string(self, i: int) -> str | None:
+        if i == _NONE:
+            return None
+        try:
+            return self._get_strings()[i]
+        except IndexError:
+            raise SerializationError(f"Invalid string index {i}") from None
+
+    def _iter_records(
+        self, record: struct.Struct, offset: int, count: int
+    ) -> Iterator[tuple]:
+        try:
+            return record.iter_unpack(self._data[offset : offset + count * record.size])
+        except struct.error as e:
+            raise SerializationError(f"Invalid records: {e}") from e
+
+    @property
+    def resources(self) -> list[AutoLoadResource]:
+        if self._resources is None:
+            get = self._get_string
+            records = self._iter_records(
+                _RESOURCE, self._resources_offset, self._resources_count
+            )
+            self._resources = [
+                AutoLoadResource(get(model), get(name), get(address), get(uid))
+                for model, name, address, uid in records
+            ]
+        return self._resources
+
+    @resources.setter
+    def resources(self, value: list[AutoLoadResource]) -> None:
+        self._resources = value
+
+    @property
+    def attributes(self) -> list[AutoLoadAttribute]:
+        if self._attributes is None:
+            get = self._get_string
+            records = self._iter_records(
+                _ATTRIBUTE, self._attributes_offset, self._attributes_count
+            )
+            self._attributes = [
+                AutoLoadAttribute(get(address), get(name), get(value))
+                for address, name, value in records
+            ]
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, value: list[AutoLoadAttribute]) -> None:
+        self._attributes = value
+
+    def validate(self) -> None:
+        """Decode all the data.
+
+        :raises SerializationError: if the data is corrupted
+        """
+        self.resources
+        self.attributes
+
+    def __reduce__(self):
+        # memoryview cannot be pickled
+        return AutoLoadDetails, (self.resources, self.attributes)
+
+
+def loads(data: bytes) -> LazyAutoLoadDetails:
+    """Deserialize AutoLoadDetails, resources and attributes are decoded lazily.
+
+    :raises SerializationError: if the data is not serialized autoload details
+    """
+    return LazyAutoLoadDetails(data)
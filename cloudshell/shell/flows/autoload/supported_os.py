@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+
+class SupportedOsMatcher:
+    """Checks that the device OS is supported by the shell.
+
+    String patterns and lists of them are joined into one alternation and
+    searched case insensitive, compiled patterns are used as is.
+    """
+
+    FLAGS = re.IGNORECASE | re.DOTALL
+
+    def __init__(self, pattern: re.Pattern):
+        self.pattern = pattern
+
+    @classmethod
+    def from_supported_os(
+        cls, supported_os: re.Pattern | str | list[str]
+    ) -> SupportedOsMatcher:
+        """Get matcher, it's compiled once for every supported OS value."""
+        if isinstance(supported_os, list):
+            supported_os = tuple(supported_os)
+        return _get_matcher(cls, supported_os)
+
+    def matches(self, os_string: str) -> bool:
+        return self.pattern.search(os_string) is not None
+
+
+@lru_cache(maxsize=128)
+def _get_matcher(
+    cls: type[SupportedOsMatcher], supported_os: re.Pattern | str | tuple[str, ...]
+) -> SupportedOsMatcher:
+    if isinstance(supported_os, re.Pattern):
+        return cls(supported_os)
+    if isinstance(supported_os, str):
+        supported_os = (supported_os,)
+    pattern = "|".join(f"(?:{os_pattern})" for os_pattern in supported_os)
+    return cls(re.compile(pattern, cls.FLAGS))
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from cloudshell.shell.flows.command.basic_flow import RunCommandFlow
+from cloudshell.shell.flows.utils.protocols import (
+    AsyncCliConfiguratorProtocol,
+    supports_batch,
+)
+
+
+class AsyncRunCommandFlow:
+    """Asyncio version of RunCommandFlow.
+
+    One event loop can keep sessions of many devices busy without a thread
+    per session.
+    """
+
+    parse_custom_commands = staticmethod(RunCommandFlow.parse_custom_commands)
+
+    def __init__(self, cli_configurator: AsyncCliConfiguratorProtocol):
+        self._cli_configurator = cli_configurator
+
+    async def _run_command_flow(
+        self, custom_command: str, is_config: bool = False
+    ) -> str:
+        """Execute flow which run custom command on device.
+
+        :param custom_command: the command to execute on device
+        :param is_config: if True then run command in configuration mode
+        """
+        commands = self.parse_custom_commands(custom_command)
+
+        if is_config:
+            service_manager = self._cli_configurator.config_mode_service()
+        else:
+            service_manager = self._cli_configurator.enable_mode_service()
+
+        async with service_manager as session:
+            if len(commands) > 1 and supports_batch(session):
+                responses = await session.send_commands(commands)
+            else:
+                responses = []
+                for cmd in commands:
+                    responses.append(await session.send_command(command=cmd))
+        return "\n".join(responses)
+
+    async def run_custom_command(self, custom_command: str) -> str:
+        """Execute custom command on device."""
+        return await self._run_command_flow(custom_command=custom_command)
+
+    async def run_custom_config_command(self, custom_command: str) -> str:
+        """Execute custom command in configuration mode on device."""
+        return await self._run_command_flow(
+            custom_command=custom_command, is_config=True
+        )
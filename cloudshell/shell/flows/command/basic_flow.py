@@ -1,18 +1,66 @@
 from __future__ import annotations
 
+import tempfile
+import time
+from collections.abc import Hashable, Iterator
+from functools import partial
+from typing import Callable
+
 from cloudshell.logging.utils.decorators import command_logging
 
+from cloudshell.shell.flows.command.command_parser import split_commands
+from cloudshell.shell.flows.command.metrics import MetricsSinkProtocol, get_batch_name
+from cloudshell.shell.flows.command.response_cache import ResponseCache
+from cloudshell.shell.flows.command.templates import OutputTemplate, load_template
 from cloudshell.shell.flows.interfaces import RunCommandFlowInterface
-from cloudshell.shell.flows.utils.protocols import CliConfiguratorProtocol
+from cloudshell.shell.flows.utils.protocols import (
+    CliConfiguratorProtocol,
+    SessionProtocol,
+    supports_batch,
+)
+from cloudshell.shell.flows.utils.response_buffer import ResponseBuffer
+
+
+def _send_command(session: SessionProtocol, command: str) -> list[str]:
+    return [session.send_command(command=command)]
 
 
 class RunCommandFlow(RunCommandFlowInterface):
-    def __init__(self, cli_configurator: CliConfiguratorProtocol):
+    def __init__(
+        self,
+        cli_configurator: CliConfiguratorProtocol,
+        response_cache: ResponseCache | None = None,
+        device_id: Hashable | None = None,
+        metrics_sink: MetricsSinkProtocol | None = None,
+        response_buffer_factory: Callable[[], ResponseBuffer] | None = None,
+    ):
+        """Run command flow.
+
+        :param cli_configurator: CLI configurator of the device
+        :param response_cache: cache for read-only run_custom_command responses
+        :param device_id: device key in the response cache, e.g. resource
+            address, required with the response cache
+        :param metrics_sink: records session acquire time and every command
+            latency and response size
+        :param response_buffer_factory: creates the buffer for every response,
+            e.g. to limit or compress big responses, by default the outputs
+            are joined into the string
+        """
+        if response_cache is not None and device_id is None:
+            # CLI configurator is created for every command, it's not a device key
+            raise ValueError("device_id is required with response_cache")
         self._cli_configurator = cli_configurator
+        self._response_cache = response_cache
+        self._device_id = device_id
+        self._metrics_sink = metrics_sink
+        self._response_buffer_factory = response_buffer_factory
 
-    def _run_command_flow(self, custom_command: str, is_config: bool = False) -> str:
+    def _iter_command_flow(
+        self, custom_command: str, is_config: bool = False
+    ) -> Iterator[str]:
         """Execute flow which run custom command on device.
 
+        Yields the output of every command when it's received.
         :param custom_command: the command to execute on device
         :param is_config: if True then run command in configuration mode
         """
@@ -23,15 +71,66 @@ class RunCommandFlow(RunCommandFlowInterface):
         else:
             service_manager = self._cli_configurator.enable_mode_service()
 
-        responses = []
+        sink = self._metrics_sink
+        start = time.perf_counter()
         with service_manager as session:
+            if sink is not None:
+                sink.record_session_acquire(is_config, time.perf_counter() - start)
+
+            for name, send in self._iter_sends(session, commands):
+                start = time.perf_counter()
+                responses = send()
+                if sink is not None:
+                    sink.record_command(
+                        name,
+                        is_config,
+                        time.perf_counter() - start,
+                        sum(map(len, responses)),
+                    )
+                yield from responses
+
+    def _iter_sends(
+        self, session: SessionProtocol, commands: list[str]
+    ) -> Iterator[tuple[str, Callable[[], list[str]]]]:
+        """Yield the name and the send function for every round trip."""
+        if len(commands) > 1 and supports_batch(session):
+            # responses are received together, it's measured as one command
+            send_batch = partial(session.send_commands, commands)
+            yield get_batch_name(len(commands)), send_batch
+        else:
             for cmd in commands:
-                responses.append(session.send_command(command=cmd))
-        return "\n".join(responses)
+                yield cmd, partial(_send_command, session, cmd)
+
+    def _run_command_flow(self, custom_command: str, is_config: bool = False) -> str:
+        """Execute flow which run custom command on device.
+
+        :param custom_command: the command to execute on device
+        :param is_config: if True then run command in configuration mode
+        """
+        outputs = self._iter_command_flow(custom_command, is_config)
+        if self._response_buffer_factory is None:
+            return "\n".join(outputs)
+        return self._fill_buffer(outputs, self._response_buffer_factory()).getvalue()
+
+    @staticmethod
+    def _fill_buffer(outputs: Iterator[str], buffer: ResponseBuffer) -> ResponseBuffer:
+        for i, output in enumerate(outputs):
+            if i:
+                buffer.write("\n")
+            buffer.write(output)
+        return buffer
 
     @command_logging
     def run_custom_command(self, custom_command: str) -> str:
         """Execute custom command on device."""
+        cache = self._response_cache
+        if cache is not None and cache.is_cacheable(
+            self.parse_custom_commands(custom_command)
+        ):
+            return cache.get_or_run(
+                (self._device_id, custom_command),
+                lambda: self._run_command_flow(custom_command=custom_command),
+            )
         return self._run_command_flow(custom_command=custom_command)
 
     @command_logging
@@ -39,11 +138,83 @@ class RunCommandFlow(RunCommandFlowInterface):
         """Execute custom command in configuration mode on device."""
         return self._run_command_flow(custom_command=custom_command, is_config=True)
 
+    def iter_custom_command(
+        self, custom_command: str, is_config: bool = False
+    ) -> Iterator[str]:
+        """Execute custom command on device and yield every command output.
+
+        The session is kept until the iterator is exhausted or closed.
+        """
+        return self._iter_command_flow(custom_command, is_config)
+
+    def buffer_custom_command(
+        self, custom_command: str, is_config: bool = False
+    ) -> ResponseBuffer:
+        """Execute custom command on device and write the output to the buffer.
+
+        The buffer is created with response_buffer_factory or has no limits.
+        """
+        factory = self._response_buffer_factory or ResponseBuffer
+        return self._fill_buffer(
+            self._iter_command_flow(custom_command, is_config), factory()
+        )
+
+    def spool_custom_command(
+        self,
+        custom_command: str,
+        is_config: bool = False,
+        max_memory_size: int = 10 * 1024 * 1024,
+    ) -> tempfile.SpooledTemporaryFile:
+        """Execute custom command on device and write the output to the temp file.
+
+        The output is kept in memory until it exceeds max_memory_size, then it's
+        moved to the file on the disk. The file contains the same text as
+        run_custom_command returns and is rewound to the start.
+        """
+        file = tempfile.SpooledTemporaryFile(max_size=max_memory_size, mode="w+")
+        try:
+            for i, output in enumerate(
+                self._iter_command_flow(custom_command, is_config)
+            ):
+                if i:
+                    file.write("\n")
+                file.write(output)
+        except Exception:
+            file.close()
+            raise
+        file.seek(0)
+        return file
+
+    def run_and_parse(
+        self,
+        custom_command: str,
+        template: OutputTemplate | str,
+        is_config: bool = False,
+    ) -> list[dict]:
+        """Execute custom command on device and parse the output with the template.
+
+        Every command output is parsed line by line when it's received.
+        :param custom_command: the command to execute on device
+        :param template: compiled template or the template file name
+        :param is_config: if True then run command in configuration mode
+        :return: rows, values by their names
+        """
+        if isinstance(template, str):
+            template = load_template(template)
+        lines = (
+            line
+            for output in self._iter_command_flow(custom_command, is_config)
+            for line in output.splitlines()
+        )
+        return list(template.iter_rows(lines))
+
     @staticmethod
     def parse_custom_commands(command: str, separator: str = ";") -> list[str]:
         """Parse run custom command string into the commands list.
 
+        Separators inside quotes, <<< multi-line blocks >>> and escaped with
+        a backslash don't split commands, see split_commands.
         :param str command: run custom [config] command(s)
         :param str separator: commands separator in the string
         """
-        return command.strip(separator).split(separator)
+        return split_commands(command, separator)
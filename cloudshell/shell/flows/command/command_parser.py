@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+BLOCK_START = "<<<"
+BLOCK_END = ">>>"
+
+
+@lru_cache()
+def _get_special_pattern(separator: str) -> re.Pattern:
+    return re.compile(
+        "|".join(map(re.escape, (separator, "'", '"', "\\", BLOCK_START)))
+    )
+
+
+@lru_cache()
+def _get_quoted_pattern(quote: str, separator: str) -> re.Pattern:
+    # the closing quote should be followed by a whitespace, separator or the end
+    q, sep = re.escape(quote), re.escape(separator)
+    return re.compile(rf"{q}(?:[^{q}\\]|\\.)*{q}(?=\s|{sep}|$)", re.DOTALL)
+
+
+def _is_token_start(command: str, pos: int, separator: str) -> bool:
+    return pos == 0 or command[pos - 1].isspace() or command.endswith(separator, 0, pos)
+
+
+def _is_plain(command: str) -> bool:
+    return not (
+        "'" in command or '"' in command or "\\" in command or BLOCK_START in command
+    )
+
+
+def split_commands(command: str, separator: str = ";") -> list[str]:
+    """Split commands string by the separator.
+
+    Separator doesn't split the command:
+    * inside quotes, quoted text is kept as is with the quotes; the quote
+      should start and end the word, so apostrophes in a text like
+      "description Bob's port" are ordinary characters,
+    * when escaped with a backslash, the backslash is removed,
+    * inside the block <<< ... >>>, the block can be multi-line,
+      the block text is kept as is without <<< and >>>.
+    Leading and trailing separators are ignored, like in str.strip.
+    Unclosed quotes and blocks are ordinary text.
+    """
+    if _is_plain(command):
+        return command.strip(separator).split(separator)
+
+    pattern = _get_special_pattern(separator)
+    commands, current, pos = [], [], 0
+    while True:
+        match = pattern.search(command, pos)
+        if match is None:
+            current.append(command[pos:])
+            break
+        current.append(command[pos : match.start()])
+        token, pos = match.group(), match.end()
+
+        if token == separator:
+            commands.append("".join(current))
+            current = []
+        elif token == "\\":
+            if command.startswith(separator, pos):
+                current.append(separator)
+                pos += len(separator)
+            else:
+                current.append(command[pos - 1 : pos + 1])
+                pos += 1
+        elif token == BLOCK_START:
+            end = command.find(BLOCK_END, pos)
+            if end == -1:
+                current.append(token)
+            else:
+                current.append(command[pos:end])
+                pos = end + len(BLOCK_END)
+        else:
+            quoted = None
+            if _is_token_start(command, match.start(), separator):
+                quoted = _get_quoted_pattern(token, separator).match(
+                    command, match.start()
+                )
+            if quoted is None:
+                current.append(token)
+            else:
+                current.append(quoted.group())
+                pos = quoted.end()
+    commands.append("".join(current))
+
+    start, end = 0, len(commands)
+    while start < end and not commands[start]:
+        start += 1
+    while end > start and not commands[end - 1]:
+        end -= 1
+    return commands[start:end] or [""]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+
+from cloudshell.shell.flows.command.basic_flow import RunCommandFlow
+from cloudshell.shell.flows.utils.concurrency import TaskResult, iter_completed
+from cloudshell.shell.flows.utils.protocols import CliConfiguratorProtocol
+
+
+def run_custom_command_on_many(
+    cli_configurators: Iterable[CliConfiguratorProtocol],
+    custom_command: str,
+    is_config: bool = False,
+    max_workers: int = 8,
+    timeout: float | None = None,
+    flow_class: type[RunCommandFlow] = RunCommandFlow,
+) -> Iterator[TaskResult]:
+    """Run the same custom command on many devices in parallel.
+
+    Results are yielded as they complete, TaskResult.item is the CLI
+    configurator, TaskResult.result is the command output and
+    TaskResult.error is the exception if the command failed or timed out.
+
+    :param cli_configurators: CLI configurators of the devices
+    :param custom_command: the command to execute on devices
+    :param is_config: if True then run command in configuration mode
+    :param max_workers: max number of devices used at the same time
+    :param timeout: timeout for every device in seconds
+    :param flow_class: RunCommandFlow or its subclass used for every device
+    """
+
+    def run(cli_configurator: CliConfiguratorProtocol) -> str:
+        flow = flow_class(cli_configurator)
+        if is_config:
+            return flow.run_custom_config_command(custom_command)
+        return flow.run_custom_command(custom_command)
+
+    return iter_completed(run, cli_configurators, max_workers, timeout)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import math
+import threading
+from collections import defaultdict
+
+from typing_extensions import Protocol
+
+SESSION_ACQUIRE = "session acquire"
+
+
+def get_batch_name(commands_count: int) -> str:
+    """Name of the batch send, commands aren't used to keep the names bounded."""
+    return f"<batch:{commands_count}>"
+
+
+class MetricsSinkProtocol(Protocol):
+    def record_session_acquire(self, is_config: bool, duration: float) -> None:
+        ...
+
+    def record_command(
+        self, command: str, is_config: bool, duration: float, response_size: int
+    ) -> None:
+        ...
+
+
+class LatencyHistogram:
+    """Histogram with exponential buckets, bucket i holds [2^(i-1), 2^i) ms."""
+
+    BUCKETS = 32
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.total_size = 0
+        self._buckets = [0] * self.BUCKETS
+
+    def add(self, duration: float, size: int = 0) -> None:
+        self.count += 1
+        self.total += duration
+        self.min = min(self.min, duration)
+        self.max = max(self.max, duration)
+        self.total_size += size
+        ms = duration * 1000
+        i = 0 if ms < 1 else min(int(math.log2(ms)) + 1, self.BUCKETS - 1)
+        self._buckets[i] += 1
+
+    def percentile(self, percent: float) -> float:
+        """Approximate percentile, upper bound of the bucket in seconds."""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for i, bucket_count in enumerate(self._buckets):
+            seen += bucket_count
+            if seen >= rank:
+                return min(2**i / 1000, self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "response_size": self.total_size,
+        }
+
+
+class HistogramMetricsSink:
+    """In-memory metrics sink, keeps latency histogram for every command.
+
+    Session acquire time is kept under the SESSION_ACQUIRE name.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: defaultdict[str, LatencyHistogram] = defaultdict(
+            LatencyHistogram
+        )
+
+    def record_session_acquire(self, is_config: bool, duration: float) -> None:
+        with self._lock:
+            self._histograms[SESSION_ACQUIRE].add(duration)
+
+    def record_command(
+        self, command: str, is_config: bool, duration: float, response_size: int
+    ) -> None:
+        with self._lock:
+            self._histograms[command].add(duration, response_size)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {name: h.summary() for name, h in self._histograms.items()}
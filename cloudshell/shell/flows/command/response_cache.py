@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from typing import Callable
+
+# multi-line commands, e.g. <<< >>> blocks, can hide other commands and
+# output pipes can write files, e.g. show running-config | redirect flash:x
+_UNSAFE_PATTERN = re.compile(
+    r"[\r\n]|\|\s*(?:redirect|tee|append|save)\b", re.IGNORECASE
+)
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: str | None = None
+        self.error: BaseException | None = None
+
+
+class ResponseCache:
+    """Cache of read-only command responses with TTL and LRU eviction.
+
+    Only commands matching the allowlist are cached, multi-line commands and
+    commands piped to redirect, tee, append or save are never cached.
+    Concurrent requests of the same key wait for the first one instead of
+    running it again.
+    """
+
+    DEFAULT_ALLOWED_COMMANDS = (r"show\s", r"display\s")
+
+    def __init__(
+        self,
+        ttl: float = 5,
+        max_size: int = 256,
+        allowed_commands: Iterable[str] = DEFAULT_ALLOWED_COMMANDS,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        pattern = "|".join(f"(?:{command})" for command in allowed_commands)
+        self._allowed_pattern = re.compile(rf"\s*(?:{pattern})", re.IGNORECASE)
+        self._lock = threading.Lock()
+        self._items: OrderedDict[Hashable, tuple[float, str]] = OrderedDict()
+        self._in_flight: dict[Hashable, _Call] = {}
+
+    def is_cacheable(self, commands: Iterable[str]) -> bool:
+        commands = list(commands)
+        return bool(commands) and all(
+            self._allowed_pattern.match(command) and not _UNSAFE_PATTERN.search(command)
+            for command in commands
+        )
+
+    def _get(self, key: Hashable) -> str | None:
+        try:
+            expires_at, response = self._items[key]
+        except KeyError:
+            return None
+        if expires_at < time.monotonic():
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return response
+
+    def _set(self, key: Hashable, response: str) -> None:
+        self._items[key] = (time.monotonic() + self.ttl, response)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def get_or_run(self, key: Hashable, func: Callable[[], str]) -> str:
+        """Get cached response or run the func and cache its result."""
+        with self._lock:
+            response = self._get(key)
+            if response is not None:
+                return response
+            call = self._in_flight.get(key)
+            is_owner = call is None
+            if is_owner:
+                call = self._in_flight[key] = _Call()
+
+        if not is_owner:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if call.error is None:
+                    self._set(key, call.result)
+            call.event.set()
+        return call.result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
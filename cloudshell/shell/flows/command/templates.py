@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections.abc import Iterable, Iterator
+
+import attr
+
+from cloudshell.shell.flows.utils.errors import ShellFlowsException
+
+
+class TemplateError(ShellFlowsException):
+    def __init__(self, msg: str, line_num: int | None = None):
+        self.line_num = line_num
+        if line_num is not None:
+            msg = f"Template line {line_num}: {msg}"
+        super().__init__(msg)
+
+
+_VALUE_OPTIONS = {"Filldown", "Required", "List"}
+_LINE_OPS = {"Next", "Continue"}
+_RECORD_OPS = {"Record", "NoRecord", "Clear", "Clearall"}
+_VALUE_PATTERN = re.compile(r"^Value\s+(?:([\w,]+)\s+)?(\w+)\s+(\(.*\))\s*$")
+_RULE_PATTERN = re.compile(r"^\s+(\^.*?)(?:\s+->\s+(.*))?$")
+_VAR_PATTERN = re.compile(r"\$\{(\w+)\}|\$(\w+)")
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class _Value:
+    name: str
+    regex: str
+    options: frozenset[str]
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class _Rule:
+    regex: re.Pattern
+    line_op: str = "Next"
+    record_op: str = "NoRecord"
+    new_state: str | None = None
+
+
+class OutputTemplate:
+    r"""Compiled template for parsing command outputs into rows.
+
+    The syntax is a subset of TextFSM:
+
+        Value Filldown INTERFACE (\S+)
+        Value Required STATUS (up|down)
+
+        Start
+          ^interface ${INTERFACE}
+          ^\s+status ${STATUS} -> Record
+
+    Value options: Filldown, Required, List. Rule actions:
+    [Next|Continue][.Record|.NoRecord|.Clear|.Clearall] [NewState].
+    The "End" state stops parsing. The row is recorded at the end of the
+    output unless the template defines the "EOF" state.
+    """
+
+    def __init__(self, values: list[_Value], states: dict[str, list[_Rule]]):
+        self._values = values
+        self._states = states
+        self.header = [value.name for value in values]
+
+    @classmethod
+    def from_str(cls, text: str) -> OutputTemplate:
+        values: dict[str, _Value] = {}
+        states: dict[str, list[_Rule]] = {}
+        state = None
+        for line_num, line in enumerate(text.splitlines(), 1):
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            if state is None and line.startswith("Value "):
+                value = cls._parse_value(line, line_num)
+                values[value.name] = value
+            elif not line[0].isspace():
+                state = line.strip()
+                states[state] = []
+            elif state is None:
+                raise TemplateError("Rule outside of a state", line_num)
+            else:
+                states[state].append(cls._parse_rule(line, line_num, values))
+
+        if "Start" not in states:
+            raise TemplateError("Template should have the Start state")
+        for rules in states.values():
+            for rule in rules:
+                if rule.new_state not in (None, "End", "EOF", *states):
+                    raise TemplateError(f"Unknown state {rule.new_state}")
+        return cls(list(values.values()), states)
+
+    @staticmethod
+    def _parse_value(line: str, line_num: int) -> _Value:
+        match = _VALUE_PATTERN.match(line)
+        if not match:
+            raise TemplateError(f"Invalid value definition {line!r}", line_num)
+        options_str, name, regex = match.groups()
+        options = frozenset(options_str.split(",")) if options_str else frozenset()
+        if not options <= _VALUE_OPTIONS:
+            raise TemplateError(f"Unknown value options {options_str}", line_num)
+        return _Value(name, regex, options)
+
+    @staticmethod
+    def _parse_rule(line: str, line_num: int, values: dict[str, _Value]) -> _Rule:
+        match = _RULE_PATTERN.match(line)
+        if not match:
+            raise TemplateError(f"Invalid rule {line!r}", line_num)
+        regex_str, action = match.groups()
+
+        def substitute(var_match: re.Match) -> str:
+            name = var_match.group(1) or var_match.group(2)
+            try:
+                return f"(?P<{name}>{values[name].regex})"
+            except KeyError:
+                raise TemplateError(f"Unknown value {name}", line_num)
+
+        try:
+            regex = re.compile(_VAR_PATTERN.sub(substitute, regex_str))
+        except re.error as e:
+            raise TemplateError(f"Invalid regex: {e}", line_num)
+
+        line_op, record_op, new_state = "Next", "NoRecord", None
+        if action:
+            ops, _, new_state = action.strip().partition(" ")
+            new_state = new_state.strip() or None
+            for op in ops.split("."):
+                if op in _LINE_OPS:
+                    line_op = op
+                elif op in _RECORD_OPS:
+                    record_op = op
+                elif new_state is None and "." not in ops:
+                    new_state = op
+                else:
+                    raise TemplateError(f"Unknown action {op}", line_num)
+        if line_op == "Continue" and new_state:
+            raise TemplateError("Continue cannot change the state", line_num)
+        return _Rule(regex, line_op, record_op, new_state)
+
+    def _new_row(self, row: dict | None = None) -> dict:
+        new_row = {}
+        for value in self._values:
+            if row is not None and "Filldown" in value.options:
+                filled = row[value.name]
+                # copy lists, the recorded row must not change
+                new_row[value.name] = filled[:] if isinstance(filled, list) else filled
+            else:
+                new_row[value.name] = [] if "List" in value.options else ""
+        return new_row
+
+    def _is_complete(self, row: dict) -> bool:
+        if not any(row[value.name] for value in self._values):
+            return False
+        return all(
+            row[value.name] for value in self._values if "Required" in value.options
+        )
+
+    def iter_rows(self, lines: Iterable[str]) -> Iterator[dict]:
+        """Parse lines one by one and yield rows as they are recorded."""
+        values = {value.name: value for value in self._values}
+        state = "Start"
+        rules = self._states[state]
+        row = self._new_row()
+        for line in lines:
+            for rule in rules:
+                match = rule.regex.match(line)
+                if not match:
+                    continue
+                for name, group in match.groupdict().items():
+                    if group is None:
+                        continue
+                    if "List" in values[name].options:
+                        row[name].append(group)
+                    else:
+                        row[name] = group
+
+                if rule.record_op == "Record":
+                    if self._is_complete(row):
+                        yield row
+                    row = self._new_row(row)
+                elif rule.record_op == "Clear":
+                    row = self._new_row(row)
+                elif rule.record_op == "Clearall":
+                    row = self._new_row()
+
+                if rule.new_state == "End":
+                    return
+                if rule.new_state:
+                    state = rule.new_state
+                    rules = self._states.get(state, [])
+                if rule.line_op == "Next":
+                    break
+            if state == "EOF":
+                break
+
+        # the implicit EOF state records the last row
+        if "EOF" not in self._states and self._is_complete(row):
+            yield row
+
+    def parse(self, output: str) -> list[dict]:
+        return list(self.iter_rows(output.splitlines()))
+
+
+_TEMPLATES: dict[str, tuple[int, OutputTemplate]] = {}
+_TEMPLATES_LOCK = threading.Lock()
+
+
+def load_template(file_name: str) -> OutputTemplate:
+    """Load the template file, it's compiled again only if the file was changed."""
+    mtime = os.stat(file_name).st_mtime_ns
+    cached = _TEMPLATES.get(file_name)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(file_name) as f:
+        template = OutputTemplate.from_str(f.read())
+    with _TEMPLATES_LOCK:
+        _TEMPLATES[file_name] = (mtime, template)
+    return template
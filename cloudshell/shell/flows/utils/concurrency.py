@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+import attr
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class TaskResult:
+    item: Any
+    result: Any = None
+    error: BaseException | None = None
+
+    @property
+    def is_success(self) -> bool:
+        return self.error is None
+
+
+def iter_completed(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = 8,
+    timeout: float | None = None,
+) -> Iterator[TaskResult]:
+    """Run func for every item on a thread pool and yield results as they finish.
+
+    The timeout is measured for every item from the moment it starts running.
+    A thread cannot be interrupted, so the timed out item is reported with
+    TimeoutError, but it keeps its worker until func returns.
+    """
+    starts: dict[int, float] = {}
+
+    def run(i: int, item: Any) -> Any:
+        starts[i] = time.monotonic()
+        return func(item)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures: dict[Future, tuple[int, Any]] = {
+        executor.submit(run, i, item): (i, item) for i, item in enumerate(items)
+    }
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(
+                pending,
+                timeout=_get_wait_timeout(pending, futures, starts, timeout),
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                item = futures[future][1]
+                error = future.exception()
+                if error is None:
+                    yield TaskResult(item, result=future.result())
+                else:
+                    yield TaskResult(item, error=error)
+
+            if timeout is not None:
+                now = time.monotonic()
+                for future in list(pending):
+                    i, item = futures[future]
+                    if i in starts and now - starts[i] >= timeout:
+                        pending.remove(future)
+                        yield TaskResult(
+                            item, error=TimeoutError(f"Timed out after {timeout}s")
+                        )
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _get_wait_timeout(
+    pending: set[Future],
+    futures: dict[Future, tuple[int, Any]],
+    starts: dict[int, float],
+    timeout: float | None,
+) -> float | None:
+    if timeout is None:
+        return None
+    started = [starts[futures[f][0]] for f in pending if futures[f][0] in starts]
+    if not started:
+        return timeout
+    return max(0.0, min(started) + timeout - time.monotonic())
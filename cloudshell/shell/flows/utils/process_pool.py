@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import pickle
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# fork of the multithreaded process can deadlock in the child
+DEFAULT_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_LOCK = threading.Lock()
+_MAX_WORKERS: int | None = None
+_START_METHOD = DEFAULT_START_METHOD
+
+
+def configure_process_pool(
+    max_workers: int | None = None, start_method: str = DEFAULT_START_METHOD
+) -> None:
+    """Configure the shared process pool, the running pool is shut down.
+
+    :param max_workers: number of worker processes, CPUs count by default
+    :param start_method: "forkserver" or "spawn", "fork" isn't safe in
+        the multithreaded process
+    """
+    global _MAX_WORKERS, _START_METHOD
+    with _POOL_LOCK:
+        _MAX_WORKERS, _START_METHOD = max_workers, start_method
+    shutdown_process_pool()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get the process pool shared in the process, it's started on first use."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(
+                max_workers=_MAX_WORKERS,
+                mp_context=multiprocessing.get_context(_START_METHOD),
+            )
+        return _POOL
+
+
+def _discard_broken_pool(pool: ProcessPoolExecutor) -> None:
+    global _POOL
+    with _POOL_LOCK:
+        # the pool could be already recreated by another thread
+        if _POOL is pool:
+            _POOL = None
+    pool.shutdown(wait=False)
+
+
+def shutdown_process_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def _run_inline(func: Callable[..., Any], *args) -> Future:
+    future = Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def submit(func: Callable[..., Any], *args, inline: bool = False) -> Future:
+    """Run the function in the shared process pool.
+
+    Function, its arguments and result are pickled to be passed between
+    processes. If the function cannot be pickled, e.g. it's a lambda or
+    a method of an unpicklable object, it's run inline. If a worker crashed
+    and the pool is broken, the function is run inline and the pool is
+    recreated on the next call.
+    """
+    if not inline:
+        try:
+            pickle.dumps(func)
+        except Exception:
+            inline = True
+    if inline:
+        return _run_inline(func, *args)
+
+    pool = get_process_pool()
+    try:
+        return pool.submit(func, *args)
+    except BrokenProcessPool:
+        logger.warning("Process pool is broken, it will be recreated")
+        _discard_broken_pool(pool)
+        return _run_inline(func, *args)
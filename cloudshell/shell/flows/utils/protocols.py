@@ -8,10 +8,22 @@ class SessionProtocol(Protocol):
         ...
 
 
+class BatchSessionProtocol(SessionProtocol, Protocol):
+    def send_commands(self, commands: list[str]) -> list[str]:
+        """Send commands without waiting for the prompt after each of them.
+
+        Returns responses split by the prompt in the same order.
+        """
+        ...
+
+
 class ServiceManagerProtocol(Protocol):
     def __enter__(self) -> SessionProtocol:
         ...
 
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        ...
+
 
 class CliConfiguratorProtocol(Protocol):
     def config_mode_service(self) -> ServiceManagerProtocol:
@@ -19,3 +31,35 @@ class CliConfiguratorProtocol(Protocol):
 
     def enable_mode_service(self) -> ServiceManagerProtocol:
         ...
+
+
+class AsyncSessionProtocol(Protocol):
+    async def send_command(self, command: str) -> str:
+        ...
+
+
+class AsyncBatchSessionProtocol(AsyncSessionProtocol, Protocol):
+    async def send_commands(self, commands: list[str]) -> list[str]:
+        ...
+
+
+class AsyncServiceManagerProtocol(Protocol):
+    async def __aenter__(self) -> AsyncSessionProtocol:
+        ...
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        ...
+
+
+class AsyncCliConfiguratorProtocol(Protocol):
+    def config_mode_service(self) -> AsyncServiceManagerProtocol:
+        ...
+
+    def enable_mode_service(self) -> AsyncServiceManagerProtocol:
+        ...
+
+
+def supports_batch(session: SessionProtocol | AsyncSessionProtocol) -> bool:
+    """Check that the session implements the batch session protocol."""
+    # look up the method on the class, proxies and mocks have any attribute
+    return callable(getattr(type(session), "send_commands", None))
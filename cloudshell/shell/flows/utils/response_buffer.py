@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import zlib
+from collections import deque
+from collections.abc import Iterator
+from enum import Enum
+
+_ENCODING = "utf-8"
+# keeps lone surrogates, the decoded value is the same as the written one
+_ERRORS = "surrogatepass"
+# smaller chunks grow when compressed
+_MIN_COMPRESS_SIZE = 256
+
+
+class TruncatePolicy(Enum):
+    HEAD = "head"  # keep the beginning of the response
+    TAIL = "tail"  # keep the end of the response
+
+    @classmethod
+    def from_str(cls, name: str) -> TruncatePolicy:
+        # raised ValueError for invalid truncate policy
+        return cls(name.lower())
+
+
+class _Chunk:
+    __slots__ = ("data", "size", "compressed")
+
+    def __init__(self, data: bytes, size: int, compressed: bool):
+        self.data = data
+        self.size = size
+        self.compressed = compressed
+
+    def get_data(self) -> bytes:
+        return zlib.decompress(self.data) if self.compressed else self.data
+
+
+class ResponseBuffer:
+    """Buffer for big command responses.
+
+    The response is kept as a list of chunks, so it's not copied on every
+    write. When the size exceeds compress_threshold the next chunks are
+    compressed with zlib. When the size exceeds max_size the response is
+    truncated according to truncate_policy, see truncated.
+    """
+
+    def __init__(
+        self,
+        max_size: int | None = None,
+        truncate_policy: TruncatePolicy = TruncatePolicy.HEAD,
+        compress_threshold: int | None = None,
+        compress_level: int = 1,
+    ):
+        """Response buffer.
+
+        :param max_size: max size of the response in bytes, unlimited by default
+        :param truncate_policy: which part of the response is kept
+        :param compress_threshold: size in bytes after which chunks are
+            compressed, by default chunks are not compressed
+        :param compress_level: zlib compression level
+        """
+        self.max_size = max_size
+        self.truncate_policy = truncate_policy
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+        self.truncated = False
+        self._chunks: deque[_Chunk] = deque()
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Size of the response in bytes."""
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the chunks, less than the size if compressed."""
+        return sum(len(chunk.data) for chunk in self._chunks)
+
+    def write(self, data: str | bytes) -> None:
+        if isinstance(data, str):
+            data = data.encode(_ENCODING, _ERRORS)
+        if not data:
+            return
+
+        if self.max_size is not None and self.truncate_policy is TruncatePolicy.HEAD:
+            free = self.max_size - self._size
+            if len(data) > free:
+                self.truncated = True
+                if free <= 0:
+                    return
+                data = data[:free]
+
+        self._append(data)
+
+        if self.max_size is not None and self._size > self.max_size:
+            self._trim_head(self._size - self.max_size)
+
+    def _append(self, data: bytes) -> None:
+        size = len(data)
+        if (
+            self.compress_threshold is not None
+            and self._size >= self.compress_threshold
+            and size >= _MIN_COMPRESS_SIZE
+        ):
+            chunk = _Chunk(zlib.compress(data, self.compress_level), size, True)
+        else:
+            chunk = _Chunk(data, size, False)
+        self._chunks.append(chunk)
+        self._size += size
+
+    def _trim_head(self, excess: int) -> None:
+        self.truncated = True
+        while excess:
+            chunk = self._chunks[0]
+            if chunk.size <= excess:
+                self._chunks.popleft()
+                self._size -= chunk.size
+                excess -= chunk.size
+            else:
+                data = chunk.get_data()[excess:]
+                self._chunks[0] = _Chunk(data, len(data), False)
+                self._size -= excess
+                excess = 0
+
+    def iter_views(self) -> Iterator[memoryview]:
+        """Iterate over the chunks without copying them.
+
+        Compressed chunks are decompressed one by one.
+        """
+        for chunk in self._chunks:
+            yield memoryview(chunk.get_data())
+
+    def getbuffer(self) -> memoryview:
+        """Return the whole response.
+
+        It isn't copied if it's stored in one uncompressed chunk.
+        """
+        if len(self._chunks) == 1 and not self._chunks[0].compressed:
+            return memoryview(self._chunks[0].data)
+        return memoryview(b"".join(self.iter_views()))
+
+    def getvalue(self) -> str:
+        # a truncated response can start or end in the middle of a character
+        errors = "ignore" if self.truncated else _ERRORS
+        return str(self.getbuffer(), _ENCODING, errors)
+
+    def clear(self) -> None:
+        self._chunks.clear()
+        self._size = 0
+        self.truncated = False
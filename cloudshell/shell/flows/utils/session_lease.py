@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable
+
+from cloudshell.shell.flows.utils.protocols import (
+    CliConfiguratorProtocol,
+    ServiceManagerProtocol,
+    SessionProtocol,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def send_empty_command(session: SessionProtocol) -> bool:
+    """Default health check, the same as the StateFlow health check does."""
+    try:
+        session.send_command(command="")
+    except Exception:
+        logger.debug("Leased session is not alive", exc_info=True)
+        return False
+    return True
+
+
+class _SessionLease:
+    def __init__(self, configurator: LeasedCliConfigurator, is_config: bool):
+        self._configurator = configurator
+        self._is_config = is_config
+        self._fallback: ServiceManagerProtocol | None = None
+
+    def __enter__(self) -> SessionProtocol:
+        session = self._configurator._acquire(self._is_config)
+        if session is None:
+            # the lease is busy or it's a nested call, don't wait for it
+            service_manager = self._configurator._open_service(self._is_config)
+            session = service_manager.__enter__()
+            self._fallback = service_manager
+        return session
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        fallback, self._fallback = self._fallback, None
+        if fallback is not None:
+            fallback.__exit__(exc_type, exc_val, exc_tb)
+        else:
+            self._configurator._release(exc_type, exc_val, exc_tb)
+
+
+class LeasedCliConfigurator:
+    """CLI configurator that keeps the session between flow calls.
+
+    Use it instead of the CLI configurator in RunCommandFlow, StateFlow, etc.
+    The session is closed after it's idle for idle_timeout seconds. When the
+    other mode is requested the current mode service is closed and the other
+    one is opened, the CLI session pool switches the mode of the same session.
+    A session that raised an error is not reused and a reused session is
+    checked with health_check first. Only one flow can use the session at
+    a time. Nested calls and calls made while the session is busy don't
+    wait, they get a new session from the CLI configurator.
+    """
+
+    def __init__(
+        self,
+        cli_configurator: CliConfiguratorProtocol,
+        idle_timeout: float = 60,
+        health_check: Callable[[SessionProtocol], bool] = send_empty_command,
+    ):
+        self._cli_configurator = cli_configurator
+        self.idle_timeout = idle_timeout
+        self._health_check = health_check
+        self._lock = threading.Lock()
+        self._service_manager: ServiceManagerProtocol | None = None
+        self._session: SessionProtocol | None = None
+        self._is_config = False
+        self._timer: threading.Timer | None = None
+
+    def enable_mode_service(self) -> _SessionLease:
+        return _SessionLease(self, is_config=False)
+
+    def config_mode_service(self) -> _SessionLease:
+        return _SessionLease(self, is_config=True)
+
+    def _open_service(self, is_config: bool) -> ServiceManagerProtocol:
+        if is_config:
+            return self._cli_configurator.config_mode_service()
+        return self._cli_configurator.enable_mode_service()
+
+    def _acquire(self, is_config: bool) -> SessionProtocol | None:
+        """Acquire the leased session, returns None if it's busy."""
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            if self._session is not None and (
+                is_config != self._is_config or not self._health_check(self._session)
+            ):
+                self._close()
+
+            if self._session is None:
+                service_manager = self._open_service(is_config)
+                self._session = service_manager.__enter__()
+                self._service_manager = service_manager
+                self._is_config = is_config
+        except BaseException:
+            self._lock.release()
+            raise
+        return self._session
+
+    def _release(self, exc_type, exc_val, exc_tb) -> None:
+        try:
+            if exc_type is not None:
+                self._close(exc_type, exc_val, exc_tb)
+            else:
+                self._timer = threading.Timer(self.idle_timeout, self._expire)
+                self._timer.daemon = True
+                self._timer.start()
+        finally:
+            self._lock.release()
+
+    def _expire(self) -> None:
+        # the lease could be acquired again while the timer was firing
+        if self._lock.acquire(blocking=False):
+            try:
+                if threading.current_thread() is self._timer:
+                    self._timer = None
+                    self._close()
+            finally:
+                self._lock.release()
+
+    def _close(self, exc_type=None, exc_val=None, exc_tb=None) -> None:
+        service_manager, self._service_manager = self._service_manager, None
+        self._session = None
+        if service_manager is not None:
+            try:
+                service_manager.__exit__(exc_type, exc_val, exc_tb)
+            except Exception:
+                logger.exception("Failed to close leased session")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._close()
+
+    def __enter__(self) -> LeasedCliConfigurator:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -2,6 +2,15 @@ from __future__ import annotations
 
 import re
 
+_WRAP_CHARS = "'\""
+_NORMALIZE_PATTERN = re.compile(r"^['\"\s]+(.+?)['\"\s]+")
+_NOT_NORMALIZED_PATTERN = re.compile(r"['\"\s].+?['\"\s]")
+
+
+def _starts_with_wrap_char(path: str) -> bool:
+    # cheap equivalent of re.match(r"['\"\s]", path)
+    return bool(path) and (path[0] in _WRAP_CHARS or path[0].isspace())
+
 
 def normalize_path(path: str) -> str:
     # "' ftp://host '"   == "ftp://host"  noqa: E800
@@ -10,5 +19,15 @@ def normalize_path(path: str) -> str:
     # " 'ftp://host' "   == "ftp://host"  noqa: E800
     # ' "ftp://host" '   == "ftp://host"  noqa: E800
     # '  "ftp://host" '  == "ftp://host"  noqa: E800
-    res = re.sub(r"^['\"\s]+(.+?)['\"\s]+", r"\g<1>", path)
-    return res
+    if not _starts_with_wrap_char(path):
+        # the pattern is anchored to quotes or spaces at the start,
+        # a clean path is returned as is without running the regex
+        return path
+    return _NORMALIZE_PATTERN.sub(r"\g<1>", path)
+
+
+def is_path_normalized(path: str) -> bool:
+    """Check that the path is not wrapped with quotes or spaces."""
+    if not _starts_with_wrap_char(path):
+        return True
+    return _NOT_NORMALIZED_PATTERN.match(path) is None
@@ -8,6 +8,7 @@ import attr
 from typing_extensions import Protocol
 
 from cloudshell.shell.flows.utils.errors import ShellFlowsException
+from cloudshell.shell.flows.utils.str_helpers import is_path_normalized
 
 
 class UrlError(ShellFlowsException):
@@ -189,7 +190,7 @@ class RemoteURL(AbstractUrlWithPosixPath):
 
     @classmethod
     def from_str(cls, url_str: str, scheme: str | None = None) -> RemoteURL:
-        assert re.match(r"['\"\s].+?['\"\s]", url_str) is None
+        assert is_path_normalized(url_str)
         if scheme:
             url_str = f"{scheme}://{url_str}"
         args = None
@@ -263,7 +264,7 @@ class BasicLocalUrl(AbstractUrlWithPosixPath):
 
     @classmethod
     def from_str(cls, url_str: str, scheme: str | None = None) -> BasicLocalUrl:
-        assert re.match(r"['\"\s].+?['\"\s]", url_str) is None
+        assert is_path_normalized(url_str)
         if not scheme:
             try:
                 scheme, delimiter, path = cls.PATTERN.search(url_str).groups()
@@ -305,7 +306,7 @@ class LocalFileURL(AbstractUrlWithPosixPath):
 
     @classmethod
     def from_str(cls, url_str: str, scheme: str | None = None) -> LocalFileURL:
-        assert re.match(r"['\"\s].+?['\"\s]", url_str) is None
+        assert is_path_normalized(url_str)
         if scheme:
             assert scheme == cls.SCHEME
             path = url_str
@@ -1,12 +1,25 @@
 import os
-from unittest import TestCase
+import tempfile
+from unittest import TestCase, mock
 
-from cloudshell.shell.flows.autoload.autoload_utils import get_device_name
+from cloudshell.shell.flows.autoload import autoload_utils
+from cloudshell.shell.flows.autoload.autoload_utils import (
+    compile_device_names_map,
+    get_device_name,
+    get_device_names,
+)
 
 
 class TestGetDeviceName(TestCase):
     FILE_PATH = os.path.join(os.path.dirname(__file__), "device_names_map.csv")
 
+    def _create_map_file(self, content):
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
     def test_get_device_name(self):
         name = get_device_name(self.FILE_PATH, "cisco12012")
         self.assertEqual(name, "Cisco 12012")
@@ -18,3 +31,151 @@ class TestGetDeviceName(TestCase):
     def test_get_device_name__csv_file_not_exists(self):
         name = get_device_name("not_exists_file.csv", "cisco")
         self.assertEqual(name, "cisco")
+
+    def test_get_device_names(self):
+        names = get_device_names(self.FILE_PATH, ["cisco12012", "fake", "cisco2801"])
+        self.assertEqual(names, ["Cisco 12012", "fake", "Cisco 2801"])
+
+    def test_get_device_name__first_row_wins(self):
+        path = self._create_map_file("oid:First\noid:Second\n")
+        self.assertEqual(get_device_name(path, "oid"), "First")
+
+    def test_get_device_name__file_parsed_once(self):
+        path = self._create_map_file("oid:Name\n")
+        with mock.patch.object(
+            autoload_utils,
+            "_read_device_names",
+            wraps=autoload_utils._read_device_names,
+        ) as read_mock:
+            get_device_name(path, "oid")
+            get_device_names(path, ["oid", "other"])
+        read_mock.assert_called_once()
+
+    def test_get_device_name__file_reloaded_after_change(self):
+        path = self._create_map_file("oid:Old\n")
+        self.assertEqual(get_device_name(path, "oid"), "Old")
+
+        with open(path, "w") as f:
+            f.write("oid:New name\n")
+        self.assertEqual(get_device_name(path, "oid"), "New name")
+
+    def test_get_device_name__match_subtree(self):
+        path = self._create_map_file(
+            "1.3.6.1.4.1.9:Cisco\n"
+            "1.3.6.1.4.1.9.1:Cisco Product\n"
+            "1.3.6.1.4.1.9.1.1745:Cisco Catalyst 3850\n"
+        )
+        names = get_device_names(
+            path,
+            [
+                "1.3.6.1.4.1.9.1.1745",
+                "1.3.6.1.4.1.9.1.1208",
+                "1.3.6.1.4.1.9.12.3",
+                "1.3.6.1.4.1.2636.1.1",
+            ],
+            match_subtree=True,
+        )
+        self.assertEqual(
+            names,
+            [
+                "Cisco Catalyst 3850",
+                "Cisco Product",
+                "Cisco",
+                "1.3.6.1.4.1.2636.1.1",
+            ],
+        )
+
+    def test_get_device_name__subtree_is_not_matched_by_default(self):
+        path = self._create_map_file("1.3.6.1.4.1.9.1:Cisco Product\n")
+        name = get_device_name(path, "1.3.6.1.4.1.9.1.1208")
+        self.assertEqual(name, "1.3.6.1.4.1.9.1.1208")
+
+    def test_get_device_name__parent_oid_is_not_matched(self):
+        path = self._create_map_file("1.3.6.1.4.1.9.1:Cisco Product\n")
+        name = get_device_name(path, "1.3.6.1.4.1.9", match_subtree=True)
+        self.assertEqual(name, "1.3.6.1.4.1.9")
+
+    def _compile_map_file(self, csv_path):
+        path = f"{csv_path}.bin"
+        compile_device_names_map(csv_path, path)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_get_device_name__compiled_map(self):
+        path = self._compile_map_file(self.FILE_PATH)
+        names = get_device_names(path, ["cisco12012", "fake", "cisco2801"])
+        self.assertEqual(names, ["Cisco 12012", "fake", "Cisco 2801"])
+
+    def test_get_device_name__compiled_map_matches_csv(self):
+        csv_path = self._create_map_file(
+            "1.3.6.1.4.1.9:Cisco\n"
+            "1.3.6.1.4.1.9.1:Cisco Product\n"
+            "1.3.6.1.4.1.9.1.1745:Cisco Catalyst 3850\n"
+            "1.3.6.1.4.1.9.1.1745:Duplicate\n"
+            "1.3.6.1.4.1.2636.1.1.1.2.29:Juniper MX240\n"
+        )
+        path = self._compile_map_file(csv_path)
+        oids = [
+            "1.3.6.1.4.1.9.1.1745",
+            "1.3.6.1.4.1.9.1.1208",
+            "1.3.6.1.4.1.9.12.3",
+            "1.3.6.1.4.1.2636.1.1.1.2.29",
+            "1.3.6.1.4.1.2636.1.1.1.2.29.1.1.1.1.1.1.1",
+            "1.3.6.1.4.1.2636",
+            "",
+        ]
+        for match_subtree in (False, True):
+            self.assertEqual(
+                get_device_names(path, oids, match_subtree=match_subtree),
+                get_device_names(csv_path, oids, match_subtree=match_subtree),
+            )
+
+    def test_get_device_name__empty_compiled_map(self):
+        path = self._compile_map_file(self._create_map_file(""))
+        self.assertEqual(get_device_name(path, "oid"), "oid")
+
+    def test_compile_device_names_map__temp_file_is_removed_on_error(self):
+        csv_path = self._create_map_file("1.3.6.1.4.1.9:Cisco\n")
+        folder = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, folder)
+        path = os.path.join(folder, "map.bin")
+        with mock.patch.object(
+            autoload_utils.os, "replace", side_effect=OSError("failed")
+        ):
+            with self.assertRaises(OSError):
+                compile_device_names_map(csv_path, path)
+        self.assertEqual(os.listdir(folder), [])
+
+    def test_compiled_map__replaced_map_is_closed(self):
+        csv_path = self._create_map_file("1.3.6.1.4.1.9:Cisco\n")
+        path = self._compile_map_file(csv_path)
+        self.assertEqual(get_device_name(path, "1.3.6.1.4.1.9"), "Cisco")
+        old_map = autoload_utils._DEVICE_NAMES_INDEX[(path, ":")][2]
+        with open(csv_path, "w") as f:
+            f.write("1.3.6.1.4.1.9:Cisco Systems\n")
+        compile_device_names_map(csv_path, path)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        self.assertEqual(get_device_name(path, "1.3.6.1.4.1.9"), "Cisco Systems")
+        self.assertTrue(old_map._data.closed)
+
+    def test_compiled_map__closed_map_is_reloaded(self):
+        path = self._compile_map_file(self.FILE_PATH)
+        get_device_name(path, "cisco12012")
+        # another thread closed the map after it was taken from the index
+        closed_map = autoload_utils._DEVICE_NAMES_INDEX[(path, ":")][2]
+        closed_map.close()
+        with mock.patch.object(
+            autoload_utils,
+            "_get_device_names_map",
+            side_effect=[closed_map, autoload_utils.CompiledOidMap(path)],
+        ):
+            self.assertEqual(get_device_name(path, "cisco12012"), "Cisco 12012")
+
+    def test_compiled_map__is_read_into_memory_on_windows(self):
+        path = self._compile_map_file(self.FILE_PATH)
+        with mock.patch.object(autoload_utils.os, "name", "nt"):
+            names_map = autoload_utils.CompiledOidMap(path)
+        self.assertIsInstance(names_map._data, bytes)
+        self.assertEqual(names_map.get("cisco12012"), "Cisco 12012")
@@ -1,8 +1,9 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from cloudshell.shell.flows.autoload.basic_flow import AbstractAutoloadFlow
+from cloudshell.shell.flows.autoload.cache import AutoloadCache
 
 VENDOR_ATTR_NAME = "Test Vendor"
 MODEL_ATTR_NAME = "Test Model"
@@ -61,3 +62,121 @@ def test_log_device_details(logger, logger_handler, autoload_flow):
         f'Model: "{MODEL_ATTR_NAME}", '
         'OS Version: ""'
     )
+
+
+def test_discover_without_fingerprint_is_not_cached(autoload_flow):
+    autoload_flow.autoload_cache = AutoloadCache()
+    autoload_flow._autoload_flow = MagicMock(return_value=AUTOLOAD_DETAILS)
+    # act
+    autoload_flow.discover(MagicMock(), MagicMock())
+    autoload_flow.discover(MagicMock(), MagicMock())
+    # verify
+    assert autoload_flow._autoload_flow.call_count == 2
+
+
+def test_discover_cached(autoload_flow):
+    resource_model = MagicMock()
+    resource_model.name = "resource"
+    autoload_flow.autoload_cache = AutoloadCache()
+    autoload_flow._autoload_flow = MagicMock(return_value=AUTOLOAD_DETAILS)
+    autoload_flow._get_device_fingerprint = MagicMock(return_value="fingerprint")
+    # act
+    first_result = autoload_flow.discover(MagicMock(), resource_model)
+    second_result = autoload_flow.discover(MagicMock(), resource_model)
+    autoload_flow._get_device_fingerprint.return_value = "new fingerprint"
+    autoload_flow.discover(MagicMock(), resource_model)
+    # verify
+    assert first_result is second_result is AUTOLOAD_DETAILS
+    assert autoload_flow._autoload_flow.call_count == 2
+
+
+def test_discover_ignores_cache_write_error(autoload_flow):
+    autoload_flow.autoload_cache = MagicMock(
+        get=MagicMock(return_value=None), set=MagicMock(side_effect=OSError)
+    )
+    autoload_flow._get_device_fingerprint = MagicMock(return_value="fingerprint")
+    # act
+    result = autoload_flow.discover(MagicMock(), MagicMock())
+    # verify
+    assert result is AUTOLOAD_DETAILS
+    autoload_flow.autoload_cache.set.assert_called_once()
+
+
+def test_discover_changes(autoload_flow):
+    # act
+    changes = autoload_flow.discover_changes(MagicMock(), MagicMock(), None)
+    # verify
+    assert changes.details is AUTOLOAD_DETAILS
+    assert changes.added_attributes == AUTOLOAD_DETAILS.attributes
+
+
+@pytest.mark.parametrize(
+    ("output", "inline"), [("short output", True), ("x" * 300 * 1024, False)]
+)
+def test_submit_parser(autoload_flow, output, inline):
+    parser = MagicMock()
+    with patch(
+        "cloudshell.shell.flows.autoload.basic_flow.process_pool.submit"
+    ) as submit:
+        # act
+        result = autoload_flow._submit_parser(parser, output, "arg")
+    # verify
+    assert result is submit.return_value
+    submit.assert_called_once_with(parser, output, "arg", inline=inline)
+
+
+def test_discover_reports_phases(logger, logger_handler, autoload_flow):
+    def _autoload_flow(supported_os, resource_model):
+        with autoload_flow._phase("SNMP"):
+            pass
+        with autoload_flow._phase("parsing"):
+            pass
+        return AUTOLOAD_DETAILS
+
+    autoload_flow._autoload_flow = _autoload_flow
+    autoload_flow.phase_metrics_hook = MagicMock()
+    # act
+    autoload_flow.discover(MagicMock(), MagicMock())
+    # verify
+    (phases,) = autoload_flow.phase_metrics_hook.call_args[0]
+    assert [p.name for p in phases] == ["SNMP", "parsing"]
+    messages = [record.msg for record in logger_handler.buffer]
+    assert any(msg.startswith("Autoload phases: SNMP: wall ") for msg in messages)
+
+
+def test_discover_fetches_deferred_attributes(autoload_flow):
+    port = MagicMock(port_description=None, mtu=None)
+    resource_model = MagicMock()
+
+    def _autoload_flow(supported_os, resource_model):
+        autoload_flow._defer_attribute(port, "port_description", lambda r: ["descr"])
+        autoload_flow._defer_attribute(port, "mtu", lambda r: [1500])
+        return autoload_flow._build_details(resource_model)
+
+    autoload_flow._autoload_flow = _autoload_flow
+    autoload_flow.deferred_attributes_filter = {"port_description"}.__contains__
+    # act
+    result = autoload_flow.discover(MagicMock(), resource_model)
+    # verify
+    assert result is resource_model.build.return_value
+    assert port.port_description == "descr"
+    assert port.mtu is None
+
+
+def test_deferred_attributes_are_kept_between_phases(autoload_flow):
+    port = MagicMock(port_description=None)
+    resource_model = MagicMock()
+
+    def _autoload_flow(supported_os, resource_model):
+        with autoload_flow._phase("SNMP"):
+            autoload_flow._defer_attribute(
+                port, "port_description", lambda r: ["descr"]
+            )
+        with autoload_flow._phase("build"):
+            return autoload_flow._build_details(resource_model)
+
+    autoload_flow._autoload_flow = _autoload_flow
+    # act
+    autoload_flow.discover(MagicMock(), resource_model)
+    # verify
+    assert port.port_description == "descr"
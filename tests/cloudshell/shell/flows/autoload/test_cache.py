@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import os
+import struct
+import time
+from unittest.mock import patch
+
+import pytest
+
+from cloudshell.shell.core.driver_context import (
+    AutoLoadAttribute,
+    AutoLoadDetails,
+    AutoLoadResource,
+)
+
+from cloudshell.shell.flows.autoload.cache import (
+    AutoloadCache,
+    FileAutoloadCache,
+    build_device_fingerprint,
+)
+
+
+def _details(name: str = "Port 1") -> AutoLoadDetails:
+    return AutoLoadDetails(
+        [AutoLoadResource("GenericPort", name, "CH1/P1", "uid")],
+        [AutoLoadAttribute("", "Shell.Vendor", "Cisco")],
+    )
+
+
+def test_build_device_fingerprint():
+    fingerprint = build_device_fingerprint("1.3.6.1.4.1.9.1.1745", "16.9", 52)
+    assert fingerprint == build_device_fingerprint("1.3.6.1.4.1.9.1.1745", "16.9", 52)
+    assert fingerprint != build_device_fingerprint("1.3.6.1.4.1.9.1.1745", "16.9", 53)
+
+
+def test_cache_get_set():
+    cache = AutoloadCache()
+    details = _details()
+    assert cache.get("key") is None
+    cache.set("key", details)
+    assert cache.get("key") is details
+
+
+def test_cache_ttl():
+    cache = AutoloadCache(ttl=10)
+    with patch("cloudshell.shell.flows.autoload.cache.time.monotonic") as now:
+        now.return_value = 100
+        cache.set("key", _details())
+        now.return_value = 111
+        assert cache.get("key") is None
+
+
+def test_cache_lru_eviction():
+    cache = AutoloadCache(max_size=2)
+    cache.set("first", _details())
+    cache.set("second", _details())
+    cache.get("first")
+    cache.set("third", _details())
+
+    assert cache.get("first") is not None
+    assert cache.get("second") is None
+    assert cache.get("third") is not None
+
+
+@pytest.fixture()
+def file_cache(tmp_path) -> FileAutoloadCache:
+    return FileAutoloadCache(str(tmp_path / "cache"), max_size=2)
+
+
+def test_file_cache_persistent(file_cache):
+    file_cache.set("key", _details("Port 2"))
+
+    details = FileAutoloadCache(file_cache.folder).get("key")
+
+    assert details.resources[0].name == "Port 2"
+    assert details.attributes[0].attribute_value == "Cisco"
+
+
+def test_file_cache_ttl(file_cache):
+    file_cache.set("key", _details())
+    file_cache.ttl = -1
+    assert file_cache.get("key") is None
+
+
+def test_file_cache_reads_dont_extend_ttl(file_cache):
+    file_cache.ttl = 10
+    file_cache.set("key", _details())
+    path = file_cache._get_path("key")
+    now = time.time()
+    os.utime(path, (now, now - 5))
+
+    assert file_cache.get("key") is not None
+    assert os.path.getmtime(path) == pytest.approx(now - 5)
+
+    os.utime(path, (now, now - 11))
+    assert file_cache.get("key") is None
+
+
+def test_file_cache_read_keeps_entry_in_lru(file_cache):
+    now = time.time()
+    file_cache.set("first", _details())
+    os.utime(file_cache._get_path("first"), (now - 30, now - 30))
+    file_cache.set("second", _details())
+    os.utime(file_cache._get_path("second"), (now - 20, now - 20))
+
+    assert file_cache.get("first") is not None
+    file_cache.set("third", _details())
+
+    assert file_cache.get("first") is not None
+    assert file_cache.get("second") is None
+    assert file_cache.get("third") is not None
+
+
+def test_file_cache_eviction(file_cache):
+    now = time.time()
+    file_cache.set("first", _details())
+    os.utime(file_cache._get_path("first"), (now - 30, now - 30))
+    file_cache.set("second", _details())
+    os.utime(file_cache._get_path("second"), (now - 20, now - 20))
+    file_cache.set("third", _details())
+
+    assert file_cache.get("first") is None
+    assert file_cache.get("second") is not None
+    assert file_cache.get("third") is not None
+
+
+def test_file_cache_corrupted_file(file_cache):
+    file_cache.set("key", _details())
+    path = file_cache._get_path("key")
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data.replace(b"Cisco", b"\xff\xffsco"))
+
+    assert file_cache.get("key") is None
+
+
+def test_file_cache_corrupted_resources_count(file_cache):
+    file_cache.set("key", _details())
+    path = file_cache._get_path("key")
+    with open(path, "r+b") as f:
+        # magic, version, strings count, resources count
+        f.seek(9)
+        f.write(struct.pack("<I", 1000))
+
+    assert file_cache.get("key") is None
+
+
+def test_file_cache_temp_file_is_removed_on_error(file_cache):
+    with patch.object(os, "replace", side_effect=OSError("failed")):
+        with pytest.raises(OSError):
+            file_cache.set("key", _details())
+
+    assert os.listdir(file_cache.folder) == []
+
+
+def test_file_cache_clear(file_cache):
+    file_cache.set("key", _details())
+    file_cache.clear()
+    assert file_cache.get("key") is None
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from cloudshell.shell.flows.autoload.compact_builder import CompactDetailsBuilder
+
+
+def _fill_builder(ports_count: int) -> CompactDetailsBuilder:
+    builder = CompactDetailsBuilder()
+    builder.add_attribute("", "Shell.Vendor", "Cisco")
+    for i in range(ports_count):
+        address = f"CH1/P{i}"
+        builder.add_resource("Shell.GenericPort", f"Port {i}", address, f"uid{i}")
+        builder.add_attribute(address, "Shell.GenericPort.MTU", 1500)
+    return builder
+
+
+def test_build():
+    builder = _fill_builder(2)
+
+    details = builder.build()
+
+    assert [r.relative_address for r in details.resources] == ["CH1/P0", "CH1/P1"]
+    assert details.resources[1].name == "Port 1"
+    assert details.resources[1].unique_identifier == "uid1"
+    assert [(a.relative_address, a.attribute_value) for a in details.attributes] == [
+        ("", "Cisco"),
+        ("CH1/P0", "1500"),
+        ("CH1/P1", "1500"),
+    ]
+
+
+def test_builder_is_empty_after_build():
+    builder = _fill_builder(2)
+
+    builder.build()
+
+    assert builder.resources_count == builder.attributes_count == 0
+    assert builder.build().resources == builder.build().attributes == []
+
+
+def test_attribute_names_are_interned():
+    builder = _fill_builder(2)
+
+    first, second = builder.build().attributes[1:]
+
+    assert first.attribute_name is second.attribute_name
+
+
+def test_iter_chunks():
+    builder = _fill_builder(5)
+
+    chunks = list(builder.iter_chunks(chunk_size=2))
+
+    assert [len(c.resources) for c in chunks] == [2, 2, 1]
+    assert [len(c.attributes) for c in chunks] == [2, 2, 2]
+    assert builder.resources_count == builder.attributes_count == 0
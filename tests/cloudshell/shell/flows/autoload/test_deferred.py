@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from cloudshell.shell.flows.autoload.deferred import DeferredAttributes
+
+
+class Port:
+    def __init__(self, name: str):
+        self.name = name
+        self.port_description = None
+        self.mtu = None
+
+
+def test_resolve_in_batch():
+    ports = [Port("Port 1"), Port("Port 2")]
+    fetch = MagicMock(side_effect=lambda resources: [r.name for r in resources])
+    deferred = DeferredAttributes()
+    for port in ports:
+        deferred.add(port, "port_description", fetch)
+    # act
+    deferred.resolve()
+    # verify
+    fetch.assert_called_once_with(ports)
+    assert [p.port_description for p in ports] == ["Port 1", "Port 2"]
+    assert len(deferred) == 0
+
+
+def test_resolve_with_filter():
+    port = Port("Port 1")
+    fetch_description = MagicMock(return_value=["description"])
+    fetch_mtu = MagicMock(return_value=[1500])
+    deferred = DeferredAttributes()
+    deferred.add(port, "port_description", fetch_description)
+    deferred.add(port, "mtu", fetch_mtu)
+    # act
+    deferred.resolve(lambda name: name == "mtu")
+    # verify
+    fetch_description.assert_not_called()
+    assert port.port_description is None
+    assert port.mtu == 1500
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from cloudshell.shell.core.driver_context import (
+    AutoLoadAttribute,
+    AutoLoadDetails,
+    AutoLoadResource,
+)
+
+from cloudshell.shell.flows.autoload.details_index import (
+    AutoloadDetailsIndex,
+    get_details_index,
+)
+
+DETAILS = AutoLoadDetails(
+    [
+        AutoLoadResource("Shell.GenericChassis", "Chassis 1", "CH1"),
+        AutoLoadResource("Shell.GenericPort", "Port 1", "CH1/P1"),
+    ],
+    [
+        AutoLoadAttribute("", "Shell.Vendor", "Cisco"),
+        AutoLoadAttribute("", "CS_Switch.Vendor", "Not used"),
+        AutoLoadAttribute("CH1/P1", "Shell.GenericPort.MTU", "1500"),
+    ],
+)
+
+
+def test_get_resource():
+    index = AutoloadDetailsIndex(DETAILS)
+    assert index.get_resource("CH1/P1") is DETAILS.resources[1]
+    assert index.get_resource("CH2") is None
+
+
+def test_get_attribute():
+    index = AutoloadDetailsIndex(DETAILS)
+    assert index.get_attribute("CH1/P1", "MTU") is DETAILS.attributes[2]
+    assert index.get_attribute("CH1/P1", "Shell.GenericPort.MTU").attribute_value == (
+        "1500"
+    )
+    assert index.get_attribute("", "MTU") is None
+
+
+def test_get_attribute_value_first_attribute_wins():
+    index = AutoloadDetailsIndex(DETAILS)
+    assert index.get_attribute_value("", "Vendor") == "Cisco"
+    assert index.get_attribute_value("", "CS_Switch.Vendor") == "Not used"
+    assert index.get_attribute_value("", "Model", "") == ""
+
+
+def test_get_details_index_is_shared():
+    assert get_details_index(DETAILS) is get_details_index(DETAILS)
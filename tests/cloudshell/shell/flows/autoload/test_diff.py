@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from cloudshell.shell.core.driver_context import (
+    AutoLoadAttribute,
+    AutoLoadDetails,
+    AutoLoadResource,
+)
+
+from cloudshell.shell.flows.autoload.diff import diff_autoload_details
+
+
+def _details(ports: dict[str, str], vendor: str = "Cisco") -> AutoLoadDetails:
+    resources = [
+        AutoLoadResource("GenericPort", f"Port {addr}", addr, f"uid-{addr}")
+        for addr in ports
+    ]
+    attributes = [AutoLoadAttribute("", "Shell.Vendor", vendor)]
+    attributes.extend(
+        AutoLoadAttribute(addr, "Shell.GenericPort.Port Description", descr)
+        for addr, descr in ports.items()
+    )
+    return AutoLoadDetails(resources, attributes)
+
+
+def test_diff_without_previous_details():
+    new = _details({"CH1/P1": "uplink"})
+
+    changes = diff_autoload_details(None, new)
+
+    assert changes.details is new
+    assert changes.added_resources == new.resources
+    assert changes.added_attributes == new.attributes
+    assert not changes.removed_resources
+    assert not changes.changed_attributes
+    assert changes.has_changes
+
+
+def test_diff_without_changes():
+    changes = diff_autoload_details(
+        _details({"CH1/P1": "uplink"}), _details({"CH1/P1": "uplink"})
+    )
+    assert not changes.has_changes
+
+
+def test_diff():
+    old = _details({"CH1/P1": "uplink", "CH1/P2": "", "CH1/P3": ""})
+    new = _details({"CH1/P1": "downlink", "CH1/P2": "", "CH1/P4": ""}, "Juniper")
+    old.resources[1].name = "Old name"
+
+    changes = diff_autoload_details(old, new)
+
+    assert [r.relative_address for r in changes.added_resources] == ["CH1/P4"]
+    assert [r.relative_address for r in changes.removed_resources] == ["CH1/P3"]
+    assert [r.relative_address for r in changes.changed_resources] == ["CH1/P2"]
+    assert [a.relative_address for a in changes.added_attributes] == ["CH1/P4"]
+    assert [a.relative_address for a in changes.removed_attributes] == ["CH1/P3"]
+    assert [
+        (a.relative_address, a.attribute_value) for a in changes.changed_attributes
+    ] == [("", "Juniper"), ("CH1/P1", "downlink")]
@@ -0,0 +1,17 @@
+from unittest.mock import MagicMock
+
+from cloudshell.shell.flows.autoload.parallel import discover_many
+
+
+def test_discover_many():
+    details = MagicMock()
+    ok_flow = MagicMock(discover=MagicMock(return_value=details))
+    failed_flow = MagicMock(discover=MagicMock(side_effect=ValueError("failed")))
+    ok_job = (ok_flow, "IOS", MagicMock())
+    failed_job = (failed_flow, "IOS", MagicMock())
+    # act
+    results = {r.item[0]: r for r in discover_many([ok_job, failed_job])}
+    # verify
+    assert results[ok_flow].result is details
+    assert isinstance(results[failed_flow].error, ValueError)
+    ok_flow.discover.assert_called_once_with("IOS", ok_job[2])
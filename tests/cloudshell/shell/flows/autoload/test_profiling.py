@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import tracemalloc
+
+import pytest
+
+from cloudshell.shell.flows.autoload.profiling import PhaseProfiler
+
+
+def test_phase():
+    profiler = PhaseProfiler()
+
+    with profiler.phase("parsing"):
+        sum(range(1000))
+    with pytest.raises(ValueError):
+        with profiler.phase("failed"):
+            raise ValueError
+
+    assert [p.name for p in profiler.phases] == ["parsing", "failed"]
+    parsing = profiler.phases[0]
+    assert parsing.wall_time >= 0
+    assert parsing.cpu_time >= 0
+    assert parsing.allocated_bytes is None
+    assert str(profiler).startswith("parsing: wall ")
+
+
+def test_phase_allocated_bytes():
+    profiler = PhaseProfiler()
+
+    tracemalloc.start()
+    try:
+        with profiler.phase("building"):
+            data = [object() for _ in range(1000)]
+    finally:
+        tracemalloc.stop()
+
+    assert data
+    assert profiler.phases[0].allocated_bytes > 0
+    assert "allocated" in str(profiler.phases[0])
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import json
+import pickle
+import struct
+import timeit
+
+import pytest
+
+from cloudshell.shell.core.driver_context import (
+    AutoLoadAttribute,
+    AutoLoadDetails,
+    AutoLoadResource,
+)
+
+from cloudshell.shell.flows.autoload.serialization import (
+    _HEADER,
+    SerializationError,
+    dumps,
+    loads,
+)
+
+HEADER_SIZE = _HEADER.size
+
+
+def _chassis_details(ports_count: int) -> AutoLoadDetails:
+    resources = [AutoLoadResource("Shell.GenericChassis", "Chassis 1", "CH1", None)]
+    attributes = [
+        AutoLoadAttribute("", "Shell.Vendor", "Cisco"),
+        AutoLoadAttribute("", "Shell.OS Version", "16.9 ✓"),
+    ]
+    for i in range(ports_count):
+        address = f"CH1/M{i // 48}/P{i % 48}"
+        resources.append(
+            AutoLoadResource("Shell.GenericPort", f"Port {i}", address, f"uid{i}")
+        )
+        attributes.extend(
+            (
+                AutoLoadAttribute(address, "Shell.GenericPort.MTU", "1500"),
+                AutoLoadAttribute(address, "Shell.GenericPort.Bandwidth", "10000"),
+                AutoLoadAttribute(address, "Shell.GenericPort.MAC Address", f"m{i}"),
+            )
+        )
+    return AutoLoadDetails(resources, attributes)
+
+
+def _as_tuples(details: AutoLoadDetails) -> tuple[list, list]:
+    return (
+        [vars(r) for r in details.resources],
+        [vars(a) for a in details.attributes],
+    )
+
+
+def test_round_trip():
+    details = _chassis_details(10_000)
+
+    data = dumps(details)
+    loaded = loads(data)
+
+    assert _as_tuples(loaded) == _as_tuples(details)
+    assert len(data) < len(pickle.dumps(details))
+
+
+def test_loads_lazily():
+    loaded = loads(dumps(_chassis_details(2)))
+
+    assert loaded._strings is None
+    assert loaded.resources[0].unique_identifier is None
+    assert loaded._attributes is None
+
+
+def test_empty_details():
+    loaded = loads(dumps(AutoLoadDetails([], [])))
+    assert loaded.resources == loaded.attributes == []
+
+
+def test_loaded_details_can_be_pickled():
+    loaded = loads(dumps(_chassis_details(1)))
+
+    unpickled = pickle.loads(pickle.dumps(loaded))
+
+    assert _as_tuples(unpickled) == _as_tuples(loaded)
+
+
+@pytest.mark.parametrize("data", [b"", b"not autoload details", b"CSAD"])
+def test_loads_invalid_data(data):
+    with pytest.raises(SerializationError):
+        loads(data)
+
+
+def test_loads_truncated_data():
+    with pytest.raises(SerializationError):
+        loads(dumps(_chassis_details(1))[:-1])
+
+
+def test_attribute_without_relative_address():
+    details = AutoLoadDetails([], [AutoLoadAttribute(None, "Shell.Vendor", "Cisco")])
+
+    loaded = loads(dumps(details))
+
+    assert loaded.attributes[0].relative_address is None
+
+
+def test_loads_invalid_strings_table():
+    data = bytearray(dumps(_chassis_details(1)))
+    # the first string length
+    data[HEADER_SIZE : HEADER_SIZE + 4] = struct.pack("<I", 1000)
+
+    with pytest.raises(SerializationError, match="strings table"):
+        loads(bytes(data))
+
+
+def test_invalid_string_raises_serialization_error():
+    data = dumps(_chassis_details(1)).replace(b"Cisco", b"\xff\xffsco")
+    loaded = loads(data)
+
+    with pytest.raises(SerializationError, match="Invalid string"):
+        loaded.validate()
+
+
+def test_invalid_string_index_raises_serialization_error():
+    # the last attribute value index
+    data = dumps(_chassis_details(1))[:-4] + struct.pack("<I", 1000)
+    loaded = loads(data)
+
+    with pytest.raises(SerializationError, match="Invalid string index 1000"):
+        loaded.attributes
+
+
+@pytest.mark.parametrize("resources_count", [0, 1, 1000])
+def test_loads_invalid_resources_count(resources_count):
+    data = bytearray(dumps(_chassis_details(1)))
+    # magic, version, strings count, resources count
+    struct.pack_into("<I", data, 9, resources_count)
+
+    with pytest.raises(SerializationError, match="resources section"):
+        loads(bytes(data))
+
+
+def _best_time(func) -> float:
+    return min(timeit.repeat(func, number=1, repeat=3))
+
+
+def _json_dumps(details: AutoLoadDetails) -> str:
+    return json.dumps(_as_tuples(details))
+
+
+def test_benchmark_against_pickle_and_json():
+    details = _chassis_details(10_000)
+    data = dumps(details)
+    pickled = pickle.dumps(details)
+    json_data = _json_dumps(details)
+
+    dumps_time = _best_time(lambda: dumps(details))
+    pickle_dumps_time = _best_time(lambda: pickle.dumps(details))
+    loads_time = _best_time(lambda: loads(data))
+    decode_time = _best_time(lambda: loads(data).validate())
+    pickle_loads_time = _best_time(lambda: pickle.loads(pickled))
+    json_loads_time = _best_time(lambda: json.loads(json_data))
+
+    # details are decoded lazily, the cache hit doesn't pay for the decoding
+    assert loads_time < pickle_loads_time
+    assert loads_time < json_loads_time
+    # full encoding and decoding stay in the same range as pickle
+    assert dumps_time < pickle_dumps_time * 3
+    assert decode_time < pickle_loads_time * 3
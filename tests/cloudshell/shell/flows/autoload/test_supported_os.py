@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from cloudshell.shell.flows.autoload.supported_os import SupportedOsMatcher
+
+
+@pytest.mark.parametrize(
+    "supported_os",
+    [
+        "IOS[ -]?XE",
+        ["NX-?OS", "IOS[ -]?XE"],
+        re.compile(r"IOS[ -]?XE"),
+    ],
+)
+def test_matches(supported_os):
+    matcher = SupportedOsMatcher.from_supported_os(supported_os)
+
+    assert matcher.matches("Cisco IOS XE Software, Version 16.09.03")
+    assert not matcher.matches("Juniper Networks, Inc. JUNOS 18.4R1")
+
+
+def test_str_patterns_are_case_insensitive():
+    matcher = SupportedOsMatcher.from_supported_os(["junos"])
+    assert matcher.matches("Juniper Networks, Inc. JUNOS 18.4R1")
+
+
+def test_pattern_flags_are_kept():
+    matcher = SupportedOsMatcher.from_supported_os(re.compile("junos"))
+    assert not matcher.matches("JUNOS")
+
+
+def test_matcher_is_cached():
+    first = SupportedOsMatcher.from_supported_os(["NX-?OS", "IOS"])
+    second = SupportedOsMatcher.from_supported_os(["NX-?OS", "IOS"])
+    assert first is second
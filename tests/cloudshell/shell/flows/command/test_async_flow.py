@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+
+from cloudshell.shell.flows.command.async_flow import AsyncRunCommandFlow
+
+
+class FakeAsyncSession:
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.commands = []
+
+    async def send_command(self, command: str) -> str:
+        await asyncio.sleep(0)
+        self.commands.append(command)
+        return f"{self.mode}: {command}"
+
+
+class FakeAsyncBatchSession(FakeAsyncSession):
+    async def send_commands(self, commands: list[str]) -> list[str]:
+        return [f"batch: {command}" for command in commands]
+
+
+class FakeServiceManager:
+    def __init__(self, session: FakeAsyncSession):
+        self.session = session
+        self.is_open = False
+
+    async def __aenter__(self) -> FakeAsyncSession:
+        self.is_open = True
+        return self.session
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.is_open = False
+
+
+class FakeCliConfigurator:
+    def __init__(self, session_class=FakeAsyncSession):
+        self.enable_manager = FakeServiceManager(session_class("enable"))
+        self.config_manager = FakeServiceManager(session_class("config"))
+
+    def enable_mode_service(self) -> FakeServiceManager:
+        return self.enable_manager
+
+    def config_mode_service(self) -> FakeServiceManager:
+        return self.config_manager
+
+
+def test_run_custom_command():
+    cli_configurator = FakeCliConfigurator()
+    flow = AsyncRunCommandFlow(cli_configurator)
+    # act
+    result = asyncio.run(flow.run_custom_command("cmd1;cmd2"))
+    # verify
+    assert result == "enable: cmd1\nenable: cmd2"
+    assert cli_configurator.enable_manager.session.commands == ["cmd1", "cmd2"]
+    assert not cli_configurator.enable_manager.is_open
+
+
+def test_run_custom_config_command():
+    flow = AsyncRunCommandFlow(FakeCliConfigurator())
+    # act
+    result = asyncio.run(flow.run_custom_config_command("cmd"))
+    # verify
+    assert result == "config: cmd"
+
+
+def test_run_custom_command_batch():
+    flow = AsyncRunCommandFlow(FakeCliConfigurator(FakeAsyncBatchSession))
+    # act
+    result = asyncio.run(flow.run_custom_command("cmd1;cmd2"))
+    # verify
+    assert result == "batch: cmd1\nbatch: cmd2"
+
+
+def test_run_on_many_devices_concurrently():
+    flows = [AsyncRunCommandFlow(FakeCliConfigurator()) for _ in range(100)]
+
+    async def run_all():
+        return await asyncio.gather(*(f.run_custom_command("show") for f in flows))
+
+    # act
+    results = asyncio.run(run_all())
+    # verify
+    assert results == ["enable: show"] * 100
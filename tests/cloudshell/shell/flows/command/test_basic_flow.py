@@ -2,6 +2,9 @@ import unittest
 from unittest import mock
 
 from cloudshell.shell.flows.command.basic_flow import RunCommandFlow
+from cloudshell.shell.flows.command.response_cache import ResponseCache
+from cloudshell.shell.flows.command.templates import OutputTemplate
+from cloudshell.shell.flows.utils.response_buffer import ResponseBuffer
 
 
 class TestRunCommandFlow(unittest.TestCase):
@@ -76,3 +79,169 @@ class TestRunCommandFlow(unittest.TestCase):
         # verify
         self.config_session.send_command.assert_called_once_with(command=custom_command)
         self.assertEqual(result, expected_cmd_response)
+
+    def test_run_command_flow_batch(self):
+        class BatchSession:
+            send_command = mock.MagicMock()
+            send_commands = mock.MagicMock(return_value=["output1", "output2"])
+
+        session = BatchSession()
+        service_manager = self.cli_configurator.enable_mode_service.return_value
+        service_manager.__enter__.return_value = session
+        # act
+        result = self.run_flow._run_command_flow(custom_command="cmd1;cmd2")
+        # verify
+        session.send_commands.assert_called_once_with(["cmd1", "cmd2"])
+        session.send_command.assert_not_called()
+        self.assertEqual(result, "output1\noutput2")
+
+    def test_run_command_flow_without_batch_support(self):
+        self.enable_session.send_command.side_effect = ["output1", "output2"]
+        # act
+        result = self.run_flow._run_command_flow(custom_command="cmd1;cmd2")
+        # verify
+        self.enable_session.send_commands.assert_not_called()
+        self.enable_session.send_command.assert_has_calls(
+            [mock.call(command="cmd1"), mock.call(command="cmd2")]
+        )
+        self.assertEqual(result, "output1\noutput2")
+
+    def test_iter_custom_command(self):
+        self.enable_session.send_command.side_effect = ["output1", "output2"]
+        # act
+        outputs = self.run_flow.iter_custom_command("cmd1;cmd2")
+        # verify
+        self.assertEqual(next(outputs), "output1")
+        self.enable_session.send_command.assert_called_once_with(command="cmd1")
+        self.assertEqual(list(outputs), ["output2"])
+
+    def test_iter_custom_command_in_config_mode(self):
+        self.config_session.send_command.return_value = "output"
+        # act
+        result = list(self.run_flow.iter_custom_command("cmd", is_config=True))
+        # verify
+        self.assertEqual(result, ["output"])
+
+    def test_spool_custom_command(self):
+        self.enable_session.send_command.side_effect = ["output1", "x" * 100]
+        # act
+        with self.run_flow.spool_custom_command("cmd1;cmd2", max_memory_size=10) as f:
+            # verify
+            self.assertTrue(f._rolled)
+            self.assertEqual(f.read(), "output1\n" + "x" * 100)
+
+    def test_run_command_flow_with_response_buffer(self):
+        self.run_flow = RunCommandFlow(
+            self.cli_configurator,
+            response_buffer_factory=lambda: ResponseBuffer(max_size=10),
+        )
+        self.enable_session.send_command.side_effect = ["output1", "output2"]
+        # act
+        result = self.run_flow._run_command_flow("cmd1;cmd2")
+        # verify
+        self.assertEqual(result, "output1\nou")
+
+    def test_buffer_custom_command(self):
+        self.enable_session.send_command.side_effect = ["output1", "output2"]
+        # act
+        buffer = self.run_flow.buffer_custom_command("cmd1;cmd2")
+        # verify
+        self.assertEqual(buffer.getvalue(), "output1\noutput2")
+        self.assertFalse(buffer.truncated)
+
+    def test_run_and_parse(self):
+        template = OutputTemplate.from_str(
+            "Value NAME (\\S+)\nValue STATUS (up|down)\n\n"
+            "Start\n  ^${NAME} is ${STATUS} -> Record\n"
+        )
+        self.enable_session.send_command.side_effect = [
+            "Gi0/1 is up\nGi0/2 is down",
+            "Gi0/3 is up",
+        ]
+        # act
+        result = self.run_flow.run_and_parse("cmd1;cmd2", template)
+        # verify
+        self.assertEqual(
+            result,
+            [
+                {"NAME": "Gi0/1", "STATUS": "up"},
+                {"NAME": "Gi0/2", "STATUS": "down"},
+                {"NAME": "Gi0/3", "STATUS": "up"},
+            ],
+        )
+
+    def test_run_custom_command_cached(self):
+        self.run_flow = RunCommandFlow(
+            self.cli_configurator, response_cache=ResponseCache(), device_id="device"
+        )
+        self.enable_session.send_command.return_value = "output"
+        # act
+        first = self.run_flow.run_custom_command("show version")
+        second = self.run_flow.run_custom_command("show version")
+        # verify
+        self.assertEqual(first, second)
+        self.enable_session.send_command.assert_called_once_with(command="show version")
+
+    def test_config_commands_are_not_cached(self):
+        self.run_flow = RunCommandFlow(
+            self.cli_configurator, response_cache=ResponseCache(), device_id="device"
+        )
+        self.enable_session.send_command.return_value = "output"
+        self.config_session.send_command.return_value = "output"
+        # act
+        self.run_flow.run_custom_command("reload")
+        self.run_flow.run_custom_command("reload")
+        self.run_flow.run_custom_config_command("show version")
+        self.run_flow.run_custom_config_command("show version")
+        # verify
+        self.assertEqual(self.enable_session.send_command.call_count, 2)
+        self.assertEqual(self.config_session.send_command.call_count, 2)
+
+    def test_response_cache_requires_device_id(self):
+        with self.assertRaisesRegex(ValueError, "device_id"):
+            RunCommandFlow(self.cli_configurator, response_cache=ResponseCache())
+
+    def test_multi_line_block_is_not_cached(self):
+        self.run_flow = RunCommandFlow(
+            self.cli_configurator, response_cache=ResponseCache(), device_id="device"
+        )
+        self.enable_session.send_command.return_value = "output"
+        # act
+        self.run_flow.run_custom_command("<<<show clock\nreload>>>")
+        self.run_flow.run_custom_command("<<<show clock\nreload>>>")
+        # verify
+        self.enable_session.send_command.assert_has_calls(
+            [mock.call(command="show clock\nreload")] * 2
+        )
+
+    def test_run_command_flow_with_metrics(self):
+        sink = mock.MagicMock()
+        self.run_flow = RunCommandFlow(self.cli_configurator, metrics_sink=sink)
+        self.config_session.send_command.side_effect = ["output1", "out2"]
+        # act
+        result = self.run_flow.run_custom_config_command("cmd1;cmd2")
+        # verify
+        self.assertEqual(result, "output1\nout2")
+        sink.record_session_acquire.assert_called_once_with(True, mock.ANY)
+        sink.record_command.assert_has_calls(
+            [
+                mock.call("cmd1", True, mock.ANY, len("output1")),
+                mock.call("cmd2", True, mock.ANY, len("out2")),
+            ]
+        )
+
+    def test_run_command_flow_batch_with_metrics(self):
+        class BatchSession:
+            send_commands = mock.MagicMock(return_value=["output1", "out2"])
+
+        sink = mock.MagicMock()
+        self.run_flow = RunCommandFlow(self.cli_configurator, metrics_sink=sink)
+        service_manager = self.cli_configurator.enable_mode_service.return_value
+        service_manager.__enter__.return_value = BatchSession()
+        # act
+        result = self.run_flow.run_custom_command("cmd1;cmd2")
+        # verify
+        self.assertEqual(result, "output1\nout2")
+        sink.record_command.assert_called_once_with(
+            "<batch:2>", False, mock.ANY, len("output1out2")
+        )
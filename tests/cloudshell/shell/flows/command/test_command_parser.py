@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pytest
+
+from cloudshell.shell.flows.command.command_parser import split_commands
+
+
+@pytest.mark.parametrize(
+    "command",
+    ["", ";", "cmd", "cmd1;cmd2", ";cmd1;;cmd2;;", " ;cmd; ", "a;b;c"],
+)
+def test_plain_commands_as_before(command):
+    assert split_commands(command) == command.strip(";").split(";")
+
+
+@pytest.mark.parametrize(
+    ("command", "expected"),
+    [
+        ('banner motd "Hello; world";end', ['banner motd "Hello; world"', "end"]),
+        ("alias x 'a;b';show x", ["alias x 'a;b'", "show x"]),
+        (r'echo "say \"hi;\"";end', [r'echo "say \"hi;\""', "end"]),
+        (r"puts a\;b;end", ["puts a;b", "end"]),
+        (r"show ip route | include \d+;end", [r"show ip route | include \d+", "end"]),
+        (
+            "conf t;banner motd <<<^C\nline 1; line 2\n^C>>>;end",
+            ["conf t", "banner motd ^C\nline 1; line 2\n^C", "end"],
+        ),
+        ("show 'unclosed;end", ["show 'unclosed", "end"]),
+        ("show <<<unclosed;end", ["show <<<unclosed", "end"]),
+        (r";cmd \;;;", ["cmd ;"]),
+        ('"";', ['""']),
+        (
+            "interface Gi0/1;description Bob's port;"
+            "interface Gi0/2;description Alice's port;end",
+            [
+                "interface Gi0/1",
+                "description Bob's port",
+                "interface Gi0/2",
+                "description Alice's port",
+                "end",
+            ],
+        ),
+        ("description it's 'a;b';end", ["description it's 'a;b'", "end"]),
+        ("description 'Bob's port;end", ["description 'Bob's port", "end"]),
+        (
+            'description 5" screen;name "x";end',
+            ['description 5" screen', 'name "x"', "end"],
+        ),
+    ],
+)
+def test_split_commands(command, expected):
+    assert split_commands(command) == expected
+
+
+def test_custom_separator():
+    assert split_commands("cmd1||'a||b'||cmd2", "||") == ["cmd1", "'a||b'", "cmd2"]
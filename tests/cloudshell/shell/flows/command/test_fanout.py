@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from cloudshell.shell.flows.command.fanout import run_custom_command_on_many
+
+
+def _cli_configurator(output=None, error=None):
+    session = mock.MagicMock(
+        send_command=mock.MagicMock(return_value=output, side_effect=error)
+    )
+    service = mock.MagicMock(__enter__=mock.MagicMock(return_value=session))
+    return mock.MagicMock(
+        enable_mode_service=mock.MagicMock(return_value=service),
+        config_mode_service=mock.MagicMock(return_value=service),
+    )
+
+
+def test_run_custom_command_on_many():
+    ok = _cli_configurator("output")
+    failed = _cli_configurator(error=ConnectionError("no connection"))
+    # act
+    results = {r.item: r for r in run_custom_command_on_many([ok, failed], "show")}
+    # verify
+    assert results[ok].result == "output"
+    assert isinstance(results[failed].error, ConnectionError)
+    ok.enable_mode_service.assert_called_once_with()
+    ok.config_mode_service.assert_not_called()
+
+
+def test_run_custom_config_command_on_many():
+    cli_configurator = _cli_configurator("output")
+    # act
+    (result,) = run_custom_command_on_many([cli_configurator], "cmd", is_config=True)
+    # verify
+    assert result.result == "output"
+    cli_configurator.config_mode_service.assert_called_once_with()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+
+from cloudshell.shell.flows.command.metrics import (
+    SESSION_ACQUIRE,
+    HistogramMetricsSink,
+    LatencyHistogram,
+)
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram()
+    for duration in (0.0005, 0.003, 0.003, 0.1):
+        histogram.add(duration, size=10)
+
+    summary = histogram.summary()
+
+    assert summary["count"] == 4
+    assert summary["min"] == 0.0005
+    assert summary["max"] == 0.1
+    assert summary["mean"] == pytest.approx(0.026625)
+    assert summary["p50"] == 0.004
+    assert summary["p99"] == 0.1
+    assert summary["response_size"] == 40
+
+
+def test_empty_histogram():
+    summary = LatencyHistogram().summary()
+    assert summary["count"] == 0
+    assert summary["p50"] == summary["min"] == 0.0
+
+
+def test_histogram_metrics_sink():
+    sink = HistogramMetricsSink()
+    sink.record_session_acquire(False, 1.5)
+    sink.record_command("show version", False, 0.2, 100)
+    sink.record_command("show version", False, 0.4, 120)
+
+    summary = sink.summary()
+
+    assert summary[SESSION_ACQUIRE]["count"] == 1
+    assert summary["show version"]["count"] == 2
+    assert summary["show version"]["response_size"] == 220
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from cloudshell.shell.flows.command.response_cache import ResponseCache
+
+
+@pytest.mark.parametrize(
+    ("commands", "expected"),
+    [
+        (["show version"], True),
+        (["  SHOW version", "display interfaces"], True),
+        (["show version", "configure terminal"], False),
+        (["showversion"], False),
+        (["show clock\nreload"], False),
+        (["show clock\rreload"], False),
+        (["\nreload"], False),
+        (["show running-config | redirect flash:x"], False),
+        (["show run |tee flash:x"], False),
+        (["show log | Append disk0:log"], False),
+        (["display current-configuration | save cfg"], False),
+        (["show run | include teenager"], True),
+        ([], False),
+    ],
+)
+def test_is_cacheable(commands, expected):
+    assert ResponseCache().is_cacheable(commands) is expected
+
+
+def test_custom_allowlist():
+    cache = ResponseCache(allowed_commands=[r"get\s"])
+    assert cache.is_cacheable(["get system status"])
+    assert not cache.is_cacheable(["show version"])
+
+
+def test_get_or_run():
+    cache = ResponseCache()
+    func = mock.MagicMock(return_value="output")
+
+    assert cache.get_or_run("key", func) == "output"
+    assert cache.get_or_run("key", func) == "output"
+    func.assert_called_once_with()
+
+
+def test_ttl():
+    cache = ResponseCache(ttl=5)
+    func = mock.MagicMock(return_value="output")
+    with mock.patch(
+        "cloudshell.shell.flows.command.response_cache.time.monotonic"
+    ) as now:
+        now.return_value = 100
+        cache.get_or_run("key", func)
+        now.return_value = 106
+        cache.get_or_run("key", func)
+
+    assert func.call_count == 2
+
+
+def test_lru_eviction():
+    cache = ResponseCache(max_size=2)
+    for key in ("first", "second", "first", "third"):
+        cache.get_or_run(key, lambda: key)
+    func = mock.MagicMock(return_value="output")
+
+    cache.get_or_run("first", func)
+    func.assert_not_called()
+    cache.get_or_run("second", func)
+    func.assert_called_once_with()
+
+
+def test_error_is_not_cached():
+    cache = ResponseCache()
+    func = mock.MagicMock(side_effect=[ValueError, "output"])
+
+    with pytest.raises(ValueError):
+        cache.get_or_run("key", func)
+    assert cache.get_or_run("key", func) == "output"
+
+
+def test_single_flight():
+    cache = ResponseCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def func():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "output"
+
+    with ThreadPoolExecutor(4) as executor:
+        first = executor.submit(cache.get_or_run, "key", func)
+        started.wait(5)
+        others = [executor.submit(cache.get_or_run, "key", func) for _ in range(3)]
+        release.set()
+        results = [f.result(5) for f in [first, *others]]
+
+    assert results == ["output"] * 4
+    assert len(calls) == 1
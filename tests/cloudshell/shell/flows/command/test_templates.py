@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from cloudshell.shell.flows.command.templates import (
+    OutputTemplate,
+    TemplateError,
+    load_template,
+)
+
+INTERFACES_TEMPLATE = r"""
+# interfaces with their addresses
+Value Filldown INTERFACE (\S+)
+Value Required STATUS (up|down)
+Value List ADDRESSES (\d+\.\d+\.\d+\.\d+)
+
+Start
+  ^interface ${INTERFACE}
+  ^\s+address ${ADDRESSES}
+  ^\s+status ${STATUS} -> Record
+"""
+
+INTERFACES_OUTPUT = """\
+interface Gi0/1
+  address 10.0.0.1
+  address 10.0.0.2
+  status up
+interface Gi0/2
+  status down
+"""
+
+
+def test_parse():
+    template = OutputTemplate.from_str(INTERFACES_TEMPLATE)
+
+    assert template.header == ["INTERFACE", "STATUS", "ADDRESSES"]
+    assert template.parse(INTERFACES_OUTPUT) == [
+        {
+            "INTERFACE": "Gi0/1",
+            "STATUS": "up",
+            "ADDRESSES": ["10.0.0.1", "10.0.0.2"],
+        },
+        {"INTERFACE": "Gi0/2", "STATUS": "down", "ADDRESSES": []},
+    ]
+
+
+def test_iter_rows_is_streaming():
+    template = OutputTemplate.from_str(INTERFACES_TEMPLATE)
+    rows = template.iter_rows(iter(INTERFACES_OUTPUT.splitlines()))
+
+    assert next(rows)["INTERFACE"] == "Gi0/1"
+    assert next(rows)["INTERFACE"] == "Gi0/2"
+    assert next(rows, None) is None
+
+
+def test_required_value_skips_row():
+    template = OutputTemplate.from_str(INTERFACES_TEMPLATE)
+
+    assert template.parse("interface Gi0/1\n  address 10.0.0.1\n") == []
+
+
+def test_filldown_list_is_copied():
+    template = OutputTemplate.from_str(
+        "Value Filldown,List TAGS (\\w+)\nValue Required ID (\\d+)\n\n"
+        "Start\n  ^tag ${TAGS}\n  ^id ${ID} -> Record\n"
+    )
+
+    rows = template.parse("tag a\nid 1\ntag b\nid 2\n")
+
+    assert rows == [{"TAGS": ["a"], "ID": "1"}, {"TAGS": ["a", "b"], "ID": "2"}]
+
+
+def test_continue_and_states():
+    template = OutputTemplate.from_str(
+        "Value NAME (\\w+)\nValue VERSION (\\S+)\n\n"
+        "Start\n"
+        "  ^Device ${NAME} -> Continue\n"
+        "  ^Device \\w+ version ${VERSION}\n"
+        "  ^Modules -> Modules\n\n"
+        "Modules\n"
+        "  ^end -> End\n"
+    )
+
+    rows = template.parse("Device sw1 version 1.2\nModules\nend\nDevice sw2\n")
+
+    assert rows == []
+    assert template.parse("Device sw1 version 1.2\n") == [
+        {"NAME": "sw1", "VERSION": "1.2"}
+    ]
+
+
+def test_eof_state_disables_implicit_record():
+    template = OutputTemplate.from_str(
+        "Value NAME (\\w+)\n\nStart\n  ^name ${NAME}\n\nEOF\n"
+    )
+
+    assert template.parse("name sw1\n") == []
+
+
+def test_clear():
+    template = OutputTemplate.from_str(
+        "Value Filldown A (\\w+)\nValue B (\\w+)\n\n"
+        "Start\n  ^a ${A}\n  ^b ${B}\n  ^clear -> Clear\n  ^reset -> Clearall\n"
+    )
+
+    assert template.parse("a 1\nb 2\nclear\n") == [{"A": "1", "B": ""}]
+    assert template.parse("a 1\nb 2\nreset\n") == []
+
+
+@pytest.mark.parametrize(
+    ("text", "error"),
+    [
+        ("Value NAME (\\w+)\n", "Start state"),
+        ("Value Bad NAME (\\w+)\n\nStart\n", "Unknown value options"),
+        ("Value NAME \\w+\n\nStart\n", "Invalid value definition"),
+        ("Start\n  ^${NAME}\n", "Unknown value NAME"),
+        ("Start\n  ^(unclosed\n", "Invalid regex"),
+        ("Start\n  ^line -> Next.Bad\n", "Unknown action Bad"),
+        ("Start\n  ^line -> Continue Other\n\nOther\n", "Continue cannot"),
+        ("Start\n  ^line -> Missing\n", "Unknown state Missing"),
+    ],
+)
+def test_invalid_template(text, error):
+    with pytest.raises(TemplateError, match=error):
+        OutputTemplate.from_str(text)
+
+
+def test_error_line_num():
+    with pytest.raises(TemplateError) as e:
+        OutputTemplate.from_str("Start\n  ^line\n  ^line -> Bad.Next\n")
+
+    assert e.value.line_num == 3
+    assert str(e.value).startswith("Template line 3:")
+
+
+def test_load_template_is_cached_until_changed(tmp_path):
+    path = tmp_path / "interfaces.template"
+    path.write_text(INTERFACES_TEMPLATE)
+
+    template = load_template(str(path))
+    assert load_template(str(path)) is template
+
+    path.write_text("Value NAME (\\w+)\n\nStart\n  ^${NAME} -> Record\n")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    new_template = load_template(str(path))
+    assert new_template is not template
+    assert new_template.header == ["NAME"]
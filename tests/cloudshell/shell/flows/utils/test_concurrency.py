@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import threading
+
+from cloudshell.shell.flows.utils.concurrency import iter_completed
+
+
+def test_iter_completed():
+    def func(item):
+        if item == 3:
+            raise ValueError(item)
+        return item * 2
+
+    results = {r.item: r for r in iter_completed(func, range(5), max_workers=2)}
+
+    assert {i: r.result for i, r in results.items() if r.is_success} == {
+        0: 0,
+        1: 2,
+        2: 4,
+        4: 8,
+    }
+    assert isinstance(results[3].error, ValueError)
+
+
+def test_iter_completed_yields_as_completed():
+    release = threading.Event()
+
+    def func(item):
+        if item == "slow":
+            release.wait(5)
+        return item
+
+    results = iter_completed(func, ["slow", "fast"], max_workers=2)
+
+    assert next(results).item == "fast"
+    release.set()
+    assert next(results).item == "slow"
+
+
+def test_iter_completed_timeout():
+    release = threading.Event()
+
+    def func(item):
+        if item == "hung":
+            release.wait(5)
+        return item
+
+    try:
+        results = list(iter_completed(func, ["hung", "ok"], timeout=0.1))
+    finally:
+        release.set()
+
+    assert [(r.item, r.is_success) for r in results] == [("ok", True), ("hung", False)]
+    assert isinstance(results[1].error, TimeoutError)
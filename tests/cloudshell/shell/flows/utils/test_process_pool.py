@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from cloudshell.shell.flows.utils import process_pool
+
+
+def get_pid(*args) -> int:
+    return os.getpid()
+
+
+def raise_error(*args):
+    raise ValueError("parsing failed")
+
+
+@pytest.fixture(autouse=True)
+def shutdown_pool():
+    yield
+    process_pool.shutdown_process_pool()
+
+
+def test_submit_to_process_pool():
+    future = process_pool.submit(get_pid, "output")
+    assert future.result(timeout=30) != os.getpid()
+
+
+def test_submit_inline():
+    future = process_pool.submit(get_pid, "output", inline=True)
+    assert future.result() == os.getpid()
+
+
+def test_submit_unpicklable_function_inline():
+    future = process_pool.submit(lambda output: os.getpid(), "output")
+    assert future.result() == os.getpid()
+
+
+def test_submit_inline_error():
+    future = process_pool.submit(raise_error, "output", inline=True)
+    with pytest.raises(ValueError, match="parsing failed"):
+        future.result()
+
+
+def test_pool_is_shared():
+    assert process_pool.get_process_pool() is process_pool.get_process_pool()
+
+
+def crash_worker(*args):
+    os._exit(1)
+
+
+def test_broken_pool_is_recreated():
+    with pytest.raises(BrokenProcessPool):
+        process_pool.submit(crash_worker, "output").result(timeout=30)
+    broken_pool = process_pool.get_process_pool()
+
+    # the broken pool runs the function inline and is replaced
+    assert process_pool.submit(get_pid, "output").result() == os.getpid()
+    future = process_pool.submit(get_pid, "output")
+
+    assert future.result(timeout=30) != os.getpid()
+    assert process_pool.get_process_pool() is not broken_pool
+
+
+def test_configure_process_pool():
+    pool = process_pool.get_process_pool()
+
+    process_pool.configure_process_pool(max_workers=1, start_method="spawn")
+    try:
+        new_pool = process_pool.get_process_pool()
+        assert new_pool is not pool
+        assert new_pool._max_workers == 1
+        assert new_pool._mp_context.get_start_method() == "spawn"
+    finally:
+        process_pool.configure_process_pool()
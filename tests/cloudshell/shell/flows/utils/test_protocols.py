@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from cloudshell.shell.flows.utils.protocols import supports_batch
+
+
+class Session:
+    def send_command(self, command: str) -> str:
+        return command
+
+
+class BatchSession(Session):
+    def send_commands(self, commands: list[str]) -> list[str]:
+        return commands
+
+
+class AsyncBatchSession:
+    async def send_commands(self, commands: list[str]) -> list[str]:
+        return commands
+
+
+def test_supports_batch():
+    assert supports_batch(BatchSession())
+    assert supports_batch(AsyncBatchSession())
+    assert not supports_batch(Session())
+    assert not supports_batch(mock.MagicMock())
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import pytest
+
+from cloudshell.shell.flows.utils.response_buffer import ResponseBuffer, TruncatePolicy
+
+
+@pytest.mark.parametrize(
+    "outputs",
+    [
+        [],
+        ["output"],
+        ["output1", "", "output2"],
+        ["интерфейс", "\udcff lone surrogate", "x" * 10_000],
+    ],
+)
+@pytest.mark.parametrize("compress_threshold", [None, 0, 100])
+def test_value_is_the_same_as_joined(outputs, compress_threshold):
+    buffer = ResponseBuffer(compress_threshold=compress_threshold)
+    for i, output in enumerate(outputs):
+        if i:
+            buffer.write("\n")
+        buffer.write(output)
+
+    assert buffer.getvalue() == "\n".join(outputs)
+    assert len(buffer) == len("\n".join(outputs).encode("utf-8", "surrogatepass"))
+    assert not buffer.truncated
+
+
+def test_compression_reduces_memory():
+    buffer = ResponseBuffer(compress_threshold=1000)
+    for _ in range(10):
+        buffer.write("line of the output\n" * 100)
+
+    assert len(buffer) == 19_000
+    assert buffer.nbytes < 5000
+
+
+def test_truncate_head():
+    buffer = ResponseBuffer(max_size=10)
+    buffer.write("12345")
+    buffer.write("67890abc")
+    buffer.write("def")
+
+    assert buffer.getvalue() == "1234567890"
+    assert buffer.truncated
+
+
+@pytest.mark.parametrize("compress_threshold", [None, 0])
+def test_truncate_tail(compress_threshold):
+    buffer = ResponseBuffer(
+        max_size=300,
+        truncate_policy=TruncatePolicy.TAIL,
+        compress_threshold=compress_threshold,
+    )
+    for char in "abc":
+        buffer.write(char * 256)
+
+    assert buffer.getvalue() == "b" * 44 + "c" * 256
+    assert len(buffer) == 300
+    assert buffer.truncated
+
+
+def test_truncated_in_the_middle_of_a_character():
+    buffer = ResponseBuffer(max_size=3)
+    buffer.write("яя")
+
+    assert buffer.getvalue() == "я"
+
+
+def test_not_truncated_at_max_size():
+    buffer = ResponseBuffer(max_size=5)
+    buffer.write("12345")
+
+    assert not buffer.truncated
+
+
+def test_getbuffer_is_zero_copy_for_one_chunk():
+    data = b"output"
+    buffer = ResponseBuffer()
+    buffer.write(data)
+
+    view = buffer.getbuffer()
+
+    assert view.obj is data
+
+
+def test_iter_views():
+    buffer = ResponseBuffer(compress_threshold=1)
+    buffer.write(b"a")
+    buffer.write(b"b" * 1000)
+
+    views = list(buffer.iter_views())
+
+    assert [bytes(view) for view in views] == [b"a", b"b" * 1000]
+    assert bytes(buffer.getbuffer()) == b"a" + b"b" * 1000
+
+
+def test_clear():
+    buffer = ResponseBuffer(max_size=1)
+    buffer.write("12")
+
+    buffer.clear()
+
+    assert len(buffer) == 0
+    assert buffer.getvalue() == ""
+    assert not buffer.truncated
+
+
+def test_truncate_policy_from_str():
+    assert TruncatePolicy.from_str("Tail") is TruncatePolicy.TAIL
+    with pytest.raises(ValueError):
+        TruncatePolicy.from_str("middle")
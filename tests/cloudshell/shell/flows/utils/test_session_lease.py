@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from cloudshell.shell.flows.command.basic_flow import RunCommandFlow
+from cloudshell.shell.flows.state.basic_flow import StateFlow
+from cloudshell.shell.flows.utils.session_lease import LeasedCliConfigurator
+
+
+def _service_manager(session):
+    return mock.MagicMock(__enter__=mock.MagicMock(return_value=session))
+
+
+@pytest.fixture()
+def enable_session():
+    return mock.MagicMock(send_command=mock.MagicMock(return_value="output"))
+
+
+@pytest.fixture()
+def config_session():
+    return mock.MagicMock(send_command=mock.MagicMock(return_value="output"))
+
+
+@pytest.fixture()
+def cli_configurator(enable_session, config_session):
+    return mock.MagicMock(
+        enable_mode_service=mock.MagicMock(
+            side_effect=lambda: _service_manager(enable_session)
+        ),
+        config_mode_service=mock.MagicMock(
+            side_effect=lambda: _service_manager(config_session)
+        ),
+    )
+
+
+@pytest.fixture()
+def leased(cli_configurator):
+    with LeasedCliConfigurator(cli_configurator) as leased:
+        yield leased
+
+
+def test_session_is_reused(leased, cli_configurator, enable_session):
+    flow = RunCommandFlow(leased)
+    # act
+    flow.run_custom_command("show version")
+    flow.run_custom_command("show clock")
+    # verify
+    cli_configurator.enable_mode_service.assert_called_once_with()
+    enable_session.send_command.assert_has_calls(
+        [
+            mock.call(command="show version"),
+            mock.call(command=""),  # health check
+            mock.call(command="show clock"),
+        ]
+    )
+
+
+def test_state_flow_reuses_session(leased, cli_configurator):
+    flow = StateFlow(mock.MagicMock(), leased, mock.MagicMock())
+    # act
+    flow.health_check()
+    RunCommandFlow(leased).run_custom_command("show version")
+    # verify
+    cli_configurator.enable_mode_service.assert_called_once_with()
+
+
+def test_mode_switch(leased, cli_configurator, config_session):
+    flow = RunCommandFlow(leased)
+    # act
+    flow.run_custom_command("show version")
+    enable_manager = leased._service_manager
+    flow.run_custom_config_command("interface eth0")
+    # verify
+    enable_manager.__exit__.assert_called_once_with(None, None, None)
+    cli_configurator.config_mode_service.assert_called_once_with()
+    config_session.send_command.assert_called_once_with(command="interface eth0")
+
+
+def test_unhealthy_session_is_reopened(leased, cli_configurator, enable_session):
+    flow = RunCommandFlow(leased)
+    flow.run_custom_command("show version")
+    enable_session.send_command.side_effect = [EOFError, "output"]
+    # act
+    flow.run_custom_command("show clock")
+    # verify
+    assert cli_configurator.enable_mode_service.call_count == 2
+
+
+def test_failed_session_is_not_reused(leased, cli_configurator, enable_session):
+    flow = RunCommandFlow(leased)
+    enable_session.send_command.side_effect = [EOFError, "output"]
+    with pytest.raises(EOFError):
+        flow.run_custom_command("show version")
+    # act
+    flow.run_custom_command("show clock")
+    # verify
+    assert cli_configurator.enable_mode_service.call_count == 2
+
+
+def test_idle_session_is_closed(cli_configurator):
+    leased = LeasedCliConfigurator(cli_configurator, idle_timeout=0.01)
+    RunCommandFlow(leased).run_custom_command("show version")
+    service_manager = leased._service_manager
+    # act
+    for _ in range(100):
+        if leased._service_manager is None:
+            break
+        time.sleep(0.01)
+    # verify
+    service_manager.__exit__.assert_called_once_with(None, None, None)
+
+
+def test_nested_call_gets_new_session(leased, cli_configurator, config_session):
+    with leased.enable_mode_service() as session:
+        # act
+        result = RunCommandFlow(leased).run_custom_config_command("show run")
+        # verify
+        assert result == "output"
+        assert leased._session is session
+    config_session.send_command.assert_called_once_with(command="show run")
+    assert cli_configurator.config_mode_service.call_count == 1
+    assert leased._service_manager is not None
+
+
+def test_busy_lease_does_not_block(leased, cli_configurator):
+    outputs = RunCommandFlow(leased).iter_custom_command("show version")
+    next(outputs)  # the unfinished generator holds the session
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(
+            RunCommandFlow(leased).run_custom_command("show clock")
+        )
+    )
+    # act
+    thread.start()
+    thread.join(timeout=5)
+    # verify
+    assert not thread.is_alive()
+    assert results == ["output"]
+    assert cli_configurator.enable_mode_service.call_count == 2
+    outputs.close()